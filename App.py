@@ -1,4 +1,6 @@
 import streamlit as st
+from petroleo.aquecimento import warm_up
+from petroleo.telemetria import track_run
 
 # Configuração inicial do aplicativo
 st.set_page_config(
@@ -8,6 +10,16 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("inicio")
+
+# Painel de desempenho oculto (fora do menu): App.py?painel=desempenho
+if st.query_params.get("painel") == "desempenho":
+    from petroleo.painel import show_panel
+
+    show_panel()
+    st.stop()
+
 # Conteúdo inicial da aplicação
 st.markdown('<h2><span style="color:#FF0055;">FIAP</span> Pós Tech – Análise de Dados</h2>', unsafe_allow_html=True)
 st.subheader("Dashboard Interativo para Análise de Dados e Modelagem Preditiva")
@@ -88,3 +100,6 @@ st.markdown("""
         }
     </style>
 """, unsafe_allow_html=True)
+
+# Com a página inicial desenhada, importa as bibliotecas pesadas em segundo plano
+warm_up()
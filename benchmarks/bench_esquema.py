@@ -0,0 +1,48 @@
+"""Memória e latência de acerto de cache: esquema antigo x esquema compacto.
+
+Antigo: rótulos longos, float64 e calendário int64. Compacto: chaves curtas e
+float32/int8/int16. O acerto de cache é medido pelo mesmo caminho nos dois
+esquemas: o de `st.cache_data`, que desserializa uma cópia (pickle) a cada
+acerto. Usa o histórico equivalente a `period="max"` (40 anos sintéticos).
+
+Uso: python -m benchmarks.bench_esquema
+"""
+import pickle
+
+from benchmarks.comum import synthetic_prices, timeit, write_results
+from petroleo.alinhamento import align
+from petroleo.esquema import LABELS, compact
+from petroleo.memoria import sizeof
+
+SERIES = ["brent", "sp500", "gold", "dxy", "tasi"]
+
+
+def quadros():
+    compacto = align({nome: synthetic_prices(anos=40, seed=i) for i, nome in enumerate(SERIES)},
+                     base="brent", dtype="float32")
+    compacto["retorno"] = compacto["brent"].pct_change().fillna(0)
+    compacto["Ano"], compacto["Mês"] = compacto.index.year, compacto.index.month
+    compacto["Dia"], compacto["Dia_Semana"] = compacto.index.day, compacto.index.weekday
+    antigo = compacto.astype({c: "float64" for c in SERIES + ["retorno"]}).astype(
+        {c: "int64" for c in ["Ano", "Mês", "Dia", "Dia_Semana"]}).rename(columns=LABELS)
+    return antigo, compact(compacto)
+
+
+def main():
+    antigo, compacto = quadros()
+    serializado_antigo, serializado_compacto = pickle.dumps(antigo), pickle.dumps(compacto)
+
+    hit_antigo, _ = timeit(lambda: pickle.loads(serializado_antigo), repeat=20)
+    hit_compacto, _ = timeit(lambda: pickle.loads(serializado_compacto), repeat=20)
+    linhas = [
+        {"esquema": "antigo", "linhas": len(antigo), "mb": sizeof(antigo) / 1024 ** 2, "cache_hit_ms": hit_antigo * 1000},
+        {"esquema": "compacto", "linhas": len(compacto), "mb": sizeof(compacto) / 1024 ** 2,
+         "cache_hit_ms": hit_compacto * 1000},
+    ]
+    for linha in linhas:
+        print(f"{linha['esquema']:9s} {linha['mb']:8.2f} MB  acerto de cache {linha['cache_hit_ms']:8.4f} ms")
+    print(f"Resultados gravados em {write_results('esquema', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Benchmark do motor de features: algumas centenas de features sobre o histórico completo.
+
+Uso: python -m benchmarks.bench_features
+"""
+from benchmarks.comum import synthetic_prices, timeit, write_results
+from petroleo.alinhamento import align
+from petroleo.engenharia import FeatureSpec, build_features
+
+SERIES = ["Brent", "S&P500", "Gold", "Índice DXY", "TASI"]
+
+
+def main():
+    linhas = []
+    for anos in (5, 20, 40):
+        matriz = align({nome: synthetic_prices(anos=anos, seed=i) for i, nome in enumerate(SERIES)})
+        for spec in (FeatureSpec("Brent"),
+                     FeatureSpec("Brent", lags=tuple(range(1, 31)), windows=(5, 10, 21, 42, 63, 126, 252))):
+            segundos, features = timeit(lambda: build_features(matriz, spec), repeat=3)
+            linhas.append({"anos": anos, "linhas": len(matriz), "features": features.shape[1], "segundos": segundos})
+            print(f"anos={anos:2d} linhas={len(matriz):6d} features={features.shape[1]:4d} {segundos * 1000:8.1f} ms")
+    print(f"Resultados gravados em {write_results('features', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Bytes transferidos e tempo de decodificação das imagens: original × variante responsiva.
+
+"Antes" é o arquivo original servido por `st.image` em toda visita; "depois"
+é a variante WebP que o navegador escolhe pelo `srcset` para cada viewport
+(largura CSS do contêiner × densidade de pixels). A decodificação com Pillow
+é um indicador do custo de renderização no navegador. A página de
+introdução também é medida inteira (soma das imagens acima da dobra).
+
+Uso: python -m benchmarks.bench_imagens
+"""
+import io
+import tempfile
+import time
+
+from benchmarks.comum import ROOT, timeit, write_results
+from petroleo.imagens import ASSETS, build_variants, pick_variant
+
+# (nome, largura CSS do contêiner, densidade de pixels)
+VIEWPORTS = [("celular", 390, 3.0), ("notebook", 1100, 1.0), ("monitor_hidpi", 1580, 2.0)]
+
+
+def decodificar(dados):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(dados)) as imagem:
+        imagem.load()
+
+
+def main():
+    linhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in ASSETS:
+            origem = ROOT / nome
+            inicio = time.perf_counter()
+            variantes = build_variants(origem, destino=tmp)
+            geracao = time.perf_counter() - inicio
+            original = origem.read_bytes()
+            antes, _ = timeit(lambda: decodificar(original))
+            for viewport, largura, dpr in VIEWPORTS:
+                variante = pick_variant(variantes, largura, dpr)
+                dados = variante.path.read_bytes()
+                depois, _ = timeit(lambda: decodificar(dados))
+                linhas.append({
+                    "imagem": nome, "viewport": viewport, "variante": variante.path.name,
+                    "bytes_antes": len(original), "bytes_depois": len(dados),
+                    "decodificacao_antes_s": antes, "decodificacao_depois_s": depois,
+                    "geracao_variantes_s": geracao,
+                })
+                print(f"{nome:50s} {viewport:14s} {len(original) / 1024:8.0f} KB -> {len(dados) / 1024:6.0f} KB  "
+                      f"decodificação {antes * 1000:6.1f} -> {depois * 1000:5.1f} ms")
+
+    for viewport, _, _ in VIEWPORTS:
+        intro = [l for l in linhas if l["imagem"] == "img_IA.png" and l["viewport"] == viewport][0]
+        print(f"Introdução ({viewport}): {intro['bytes_antes'] / 1024:.0f} KB -> {intro['bytes_depois'] / 1024:.0f} KB")
+    print(f"Resultados gravados em {write_results('imagens', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Tempo até a primeira página desenhada, por página, num processo frio.
+
+Cada medição roda num processo Python novo: importa o Streamlit e executa
+a página uma vez com `AppTest` sobre fixtures offline. O tempo da primeira
+execução completa do script é um limite superior do first paint (o
+navegador recebe os elementos à medida que o script avança). Também lista
+quais bibliotecas pesadas ficaram carregadas depois da execução.
+
+Com `--apos-inicio`, cada página roda depois de `App.py` no mesmo processo,
+esperando o aquecimento em segundo plano terminar (navegação típica).
+
+Uso: python -m benchmarks.bench_inicializacao [--apos-inicio] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.comum import ROOT, criar_fixtures, write_results
+
+PAGINAS = ["App.py"] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))
+PESADAS = ["plotly", "sklearn", "xgboost", "joblib", "yfinance", "babel", "matplotlib", "seaborn", "statsmodels",
+           "prophet"]
+
+SCRIPT = """
+import json, sys, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+importacao = time.perf_counter() - inicio
+if {apos_inicio!r}:
+    AppTest.from_file("App.py", default_timeout=300).run()
+    from petroleo import aquecimento
+    if aquecimento._thread is not None:
+        aquecimento._thread.join()
+app = AppTest.from_file({pagina!r}, default_timeout=300)
+t = time.perf_counter()
+app.run()
+pagina = time.perf_counter() - t
+print(json.dumps({{"importacao_streamlit": importacao, "primeira_execucao": pagina,
+                  "total": time.perf_counter() - inicio, "excecao": bool(app.exception),
+                  "pesadas": sorted(m for m in {pesadas!r} if m in sys.modules)}}))
+"""
+
+
+def medir(pagina, apos_inicio, env):
+    codigo = SCRIPT.format(pagina=pagina, apos_inicio=apos_inicio, pesadas=PESADAS)
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=ROOT, env=env, capture_output=True, text=True,
+                           check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apos-inicio", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    linhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        criar_fixtures(tmp)
+        env = {**os.environ, "PETROLEO_FIXTURES": str(tmp), "PETROLEO_DATA_DIR": str(tmp / "dados"),
+               "PYTHONPATH": str(ROOT)}
+        for pagina in PAGINAS:
+            medidas = [medir(pagina, args.apos_inicio, env) for _ in range(args.repeat)]
+            melhor = min(medidas, key=lambda m: m["primeira_execucao"])
+            linhas.append({"pagina": pagina, "apos_inicio": args.apos_inicio, **melhor})
+            print(f"{pagina:36s} primeira execução {melhor['primeira_execucao']:6.2f}s  "
+                  f"processo {melhor['total']:6.2f}s  pesadas: {', '.join(melhor['pesadas']) or '-'}")
+    print(f"Resultados gravados em {write_results('inicializacao', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
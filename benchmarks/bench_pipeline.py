@@ -0,0 +1,131 @@
+"""Tempo de cada etapa do pipeline dados → features → treino → previsão → gráfico.
+
+Roda offline sobre fixtures (CSV no formato de `PETROLEO_FIXTURES`): por
+padrão gera séries sintéticas de 1 a 40 anos; com `--fixtures DIR` usa
+dados gravados, sem variar o histórico. Etapas medidas:
+
+- load_data: `PriceStore.load` do Brent, com o armazenamento frio e quente;
+- get_data: `load_indices` (página de índices, todas as fontes alinhadas),
+  com o cache do CSV do TASI frio e quente, sempre em diretório temporário;
+- create_time_features: `compute_features` sobre os preços do Brent;
+- train_model: `train_booster` para cada combinação de hiperparâmetros;
+- prediction: `recursive_forecast` para cada horizonte;
+- figure: `relative_chart` sobre o período completo.
+
+Os resultados vão para benchmarks/resultados/pipeline-<timestamp>.json e .csv.
+
+Uso: python -m benchmarks.bench_pipeline [--fixtures DIR] [--anos 1 5 10 20 40]
+"""
+import argparse
+import itertools
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.comum import criar_fixtures, timeit, write_results
+from petroleo.armazenamento import FixtureSource, PriceStore
+from petroleo.coleta import FixtureTransport
+from petroleo.fontes import CsvSource
+from petroleo.features import SELECTED_FEATURES, TARGET, compute_features
+from petroleo.graficos import relative_chart
+from petroleo.indices import TASI_URL, TICKERS, load_indices
+from petroleo.previsao import future_dates, recursive_forecast
+from petroleo.treino import train_booster
+
+ANOS = [1, 5, 10, 20, 40]
+HORIZONTES = [1, 7, 30]
+GRADE = {"max_depth": [3, 6], "learning_rate": [0.05, 0.1], "num_boost_round": [100, 300]}
+
+
+def medir(fixtures, anos, repeat):
+    linhas = []
+
+    def registrar(etapa, segundos, **extra):
+        linhas.append({"anos": anos, "etapa": etapa, "segundos": segundos, **extra})
+        detalhes = " ".join(f"{k}={v}" for k, v in extra.items())
+        print(f"anos={anos!s:>4} {etapa:22s} {segundos * 1000:9.1f} ms  {detalhes}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        diretorio = Path(tmp)
+        fonte = FixtureSource(fixtures)
+
+        def frio():
+            shutil.rmtree(diretorio / "frio", ignore_errors=True)
+            return PriceStore(diretorio / "frio", fonte).load(TICKERS["Brent"])
+
+        segundos, precos = timeit(frio, repeat)
+        registrar("load_data", segundos, armazenamento="frio", linhas=len(precos))
+        quente = PriceStore(diretorio / "quente", fonte)
+        quente.load(TICKERS["Brent"])
+        segundos, _ = timeit(lambda: quente.load(TICKERS["Brent"]), repeat)
+        registrar("load_data", segundos, armazenamento="quente", linhas=len(precos))
+
+        # Fonte do TASI no diretório temporário: o cache e o espelho reais em dados/fontes ficam intactos
+        transporte = FixtureTransport(fixtures)
+
+        def tasi():
+            return CsvSource("tasi", TASI_URL, diretorio=diretorio / "fontes")
+
+        def indices_frio():
+            shutil.rmtree(diretorio / "fontes", ignore_errors=True)
+            return load_indices(quente, transporte, tasi())
+
+        segundos, (basef, _) = timeit(indices_frio, repeat)
+        registrar("get_data", segundos, cache="frio", linhas=len(basef))
+        fonte_tasi = tasi()
+        load_indices(quente, transporte, fonte_tasi)
+        segundos, (basef, _) = timeit(lambda: load_indices(quente, transporte, fonte_tasi), repeat)
+        registrar("get_data", segundos, cache="quente", linhas=len(basef))
+
+    serie = precos.set_index("Date")["Close"]
+    segundos, base = timeit(lambda: compute_features(serie), repeat)
+    registrar("create_time_features", segundos, linhas=len(base))
+
+    corte = int(len(base) * 0.8)
+    x, y = base[SELECTED_FEATURES], base[TARGET]
+    dados = (x.iloc[:corte], y.iloc[:corte], x.iloc[corte:], y.iloc[corte:])
+    booster = None
+    for profundidade, taxa, rodadas in itertools.product(*GRADE.values()):
+        params = {"objective": "reg:squarederror", "max_depth": profundidade, "learning_rate": taxa}
+        segundos, booster = timeit(lambda: train_booster(*dados, params, num_boost_round=rodadas), 1)
+        registrar("train_model", segundos, max_depth=profundidade, learning_rate=taxa,
+                  num_boost_round=rodadas, arvores=booster.num_boosted_rounds())
+
+    for horizonte in HORIZONTES:
+        datas = future_dates(serie.index[-1], horizonte)
+        segundos, _ = timeit(lambda: recursive_forecast(booster, float(serie.iloc[-1]), datas, SELECTED_FEATURES),
+                             repeat)
+        registrar("prediction", segundos, horizonte=horizonte)
+
+    colunas = ["brent", "sp500", "gold", "dxy", "tasi"]
+    inicio, fim = basef["Date"].iloc[0], basef["Date"].iloc[-1]
+    segundos, _ = timeit(lambda: relative_chart(basef, colunas, inicio, fim, 1500), repeat)
+    registrar("figure", segundos, linhas=len(basef))
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=Path, help="diretório com fixtures gravadas (CSV por ticker e TASI)")
+    parser.add_argument("--anos", type=int, nargs="+", default=ANOS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    linhas = []
+    if args.fixtures is not None:
+        linhas += medir(args.fixtures, "gravado", args.repeat)
+    else:
+        for anos in args.anos:
+            with tempfile.TemporaryDirectory() as tmp:
+                criar_fixtures(Path(tmp), anos=anos)
+                linhas += medir(Path(tmp), anos, args.repeat)
+
+    path = write_results("pipeline", linhas)
+    pd.DataFrame(linhas).to_csv(path.with_suffix(".csv"), index=False)
+    print(f"Resultados gravados em {path} e {path.with_suffix('.csv')}")
+
+
+if __name__ == "__main__":
+    main()
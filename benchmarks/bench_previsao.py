@@ -0,0 +1,42 @@
+"""Benchmark da previsão recursiva em lote: horizontes de 1 a 365 dias e 1 a 10.000 caminhos.
+
+Uso: python -m benchmarks.bench_previsao
+"""
+import numpy as np
+import xgboost as xgb
+
+from benchmarks.comum import synthetic_prices, timeit, write_results
+from petroleo.previsao import future_dates, recursive_forecast
+
+FEATURES = ["Ano", "Mês", "Dia", "Dia_Semana", "dia_anterior"]
+HORIZONTES = [1, 7, 30, 90, 365]
+CAMINHOS = [1, 10, 100, 1000, 10000]
+
+
+def treinar():
+    df = synthetic_prices(anos=20).set_index("Date")
+    X = np.column_stack([df.index.year, df.index.month, df.index.day, df.index.weekday,
+                         df["Close"].shift(1).bfill()]).astype(np.float32)
+    dtrain = xgb.DMatrix(X, label=df["Close"].to_numpy(), feature_names=FEATURES)
+    booster = xgb.train({"objective": "reg:squarederror", "max_depth": 6, "tree_method": "hist"}, dtrain, 300)
+    return booster, df.index[-1], float(df["Close"].iloc[-1])
+
+
+def main():
+    booster, ultima_data, ultimo_preco = treinar()
+    rng = np.random.default_rng(0)
+    linhas = []
+    for horizonte in HORIZONTES:
+        datas = future_dates(ultima_data, horizonte)
+        for caminhos in CAMINHOS:
+            inicio = np.full(caminhos, ultimo_preco)
+            shocks = rng.normal(0, 1, (horizonte, caminhos)).astype(np.float32)
+            segundos, _ = timeit(lambda: recursive_forecast(booster, inicio, datas, FEATURES, shocks), repeat=3)
+            linhas.append({"horizonte": horizonte, "caminhos": caminhos, "segundos": segundos,
+                           "previsoes_por_segundo": horizonte * caminhos / segundos})
+            print(f"horizonte={horizonte:4d} caminhos={caminhos:6d} {segundos * 1000:9.2f} ms")
+    print(f"Resultados gravados em {write_results('previsao', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Vazão de treino com 1, 4 e 16 usuários simultâneos, com e sem o agendador de treino.
+
+Cada "usuário" é uma thread que treina um modelo com hiperparâmetros
+próprios. Sem agendador, cada treino usa todos os núcleos (como o antigo
+`n_jobs: -1`); com agendador, os treinos passam por `TrainingScheduler`.
+
+Uso: python -m benchmarks.bench_treino
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.comum import synthetic_prices, write_results
+from petroleo.features import SELECTED_FEATURES, TARGET, compute_features
+from petroleo.treino import TrainingScheduler, train_booster
+
+USUARIOS = [1, 4, 16]
+
+
+class SemAgendador:
+    """Agendador nulo: todos os treinos ao mesmo tempo, cada um com todos os núcleos."""
+
+    total_threads = os.cpu_count() or 1
+
+    def run(self, fn):
+        return fn(self.total_threads)
+
+
+def main():
+    precos = synthetic_prices(anos=20).set_index("Date")["Close"]
+    basef = compute_features(precos)
+    corte = int(len(basef) * 0.8)
+    x, y = basef[SELECTED_FEATURES], basef[TARGET]
+    dados = (x.iloc[:corte], y.iloc[:corte], x.iloc[corte:], y.iloc[corte:])
+
+    linhas = []
+    for nome, criar in (("sem_agendador", SemAgendador), ("agendador", TrainingScheduler)):
+        for usuarios in USUARIOS:
+            agendador = criar()
+
+            def treinar(i):
+                params = {"objective": "reg:squarederror", "max_depth": 6, "learning_rate": 0.05 + 0.01 * i}
+                return train_booster(*dados, params, num_boost_round=200, scheduler=agendador)
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=usuarios) as pool:
+                list(pool.map(treinar, range(usuarios)))
+            segundos = time.perf_counter() - inicio
+            linhas.append({"modo": nome, "usuarios": usuarios, "segundos": segundos,
+                           "treinos_por_segundo": usuarios / segundos, "nucleos": os.cpu_count()})
+            print(f"{nome:14s} usuarios={usuarios:3d} {segundos:7.2f}s  {usuarios / segundos:6.2f} treinos/s")
+    print(f"Resultados gravados em {write_results('treino', linhas)}")
+
+
+if __name__ == "__main__":
+    main()
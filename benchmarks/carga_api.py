@@ -0,0 +1,76 @@
+"""Teste de carga local da API de previsão (petroleo.servico).
+
+Sobe o servidor em uma thread com dados sintéticos (nada vai para a rede),
+dispara requisições concorrentes por alguns segundos e registra
+requisições/s e latências p50/p95/p99.
+
+Uso: python -m benchmarks.carga_api [clientes] [segundos]
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.comum import synthetic_prices, write_results
+from petroleo.armazenamento import FixtureSource, PriceStore
+from petroleo.features import FeatureStore
+from petroleo.servico import ForecastService, serve
+
+
+def cliente(url_base, fim, latencias, erros, seed):
+    rng = np.random.default_rng(seed)
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"{url_base}/forecast?days={int(rng.integers(1, 31))}", timeout=10) as resp:
+                json.loads(resp.read())
+            latencias.append(time.perf_counter() - inicio)
+        except Exception:
+            erros.append(1)
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        synthetic_prices(anos=20).to_csv(tmp / "BZ=F.csv", index=False)
+        service = ForecastService(store=PriceStore(tmp / "dados", FixtureSource(tmp)),
+                                  feature_store=FeatureStore(tmp / "features"))
+        servidor = serve("127.0.0.1", 0, service)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url_base = f"http://127.0.0.1:{servidor.server_address[1]}"
+        urllib.request.urlopen(f"{url_base}/forecast?days=30").read()  # aquecimento
+
+        latencias, erros = [], []
+        fim = time.perf_counter() + segundos
+        threads = [threading.Thread(target=cliente, args=(url_base, fim, latencias, erros, i)) for i in range(clientes)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        servidor.shutdown()
+
+    lat = np.array(latencias) * 1000
+    resultado = {
+        "clientes": clientes,
+        "segundos": segundos,
+        "requisicoes": len(lat),
+        "erros": len(erros),
+        "req_por_segundo": len(lat) / segundos,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+        "p99_ms": float(np.percentile(lat, 99)),
+    }
+    print(json.dumps(resultado, indent=2))
+    print(f"Resultados gravados em {write_results('carga_api', [resultado])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Utilitários compartilhados pelos benchmarks: dados sintéticos, fixtures offline e gravação de resultados."""
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTADOS = Path(__file__).resolve().parent / "resultados"
+TASI_ARQUIVO = "Dados Históricos - Tadawul All Share.csv"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def synthetic_prices(anos=20, seed=0, fim="2025-01-31"):
+    """Série diária sintética (passeio aleatório geométrico) no formato Date/Close do armazenamento."""
+    datas = pd.bdate_range(end=fim, periods=int(anos * 252))
+    rng = np.random.default_rng(seed)
+    close = 70 * np.exp(np.cumsum(rng.normal(0, 0.02, len(datas))))
+    return pd.DataFrame({"Date": datas, "Close": close})
+
+
+def criar_fixtures(diretorio, anos=20):
+    """Grava as fontes da página de índices (quatro tickers e o CSV do TASI) em `diretorio`."""
+    for i, ticker in enumerate(["BZ=F", "^GSPC", "IAU", "DX-Y.NYB"]):
+        synthetic_prices(anos=anos, seed=i).to_csv(diretorio / f"{ticker}.csv", index=False)
+    tasi = synthetic_prices(anos=min(anos, 15), seed=9)
+    with open(diretorio / TASI_ARQUIVO, "w", encoding="utf-8") as f:
+        f.write("Data,Último\n")
+        for data, valor in zip(tasi["Date"], tasi["Close"] * 100):
+            numero = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            f.write(f'{data:%m/%d/%Y},"{numero}"\n')
+
+
+def timeit(fn, repeat=3):
+    """Menor tempo (s) entre `repeat` execuções e o resultado da última."""
+    melhor, resultado = float("inf"), None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = fn()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def write_results(nome, linhas):
+    """Grava `linhas` (lista de dicts) em benchmarks/resultados/<nome>-<timestamp>.json."""
+    RESULTADOS.mkdir(exist_ok=True)
+    payload = {
+        "benchmark": nome,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": linhas,
+    }
+    path = RESULTADOS / f"{nome}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
@@ -0,0 +1,82 @@
+"""Teste de resistência: N sessões simultâneas da página de índices com RSS limitado.
+
+Cada sessão é um `AppTest` com estado próprio. A cada rodada todas as
+sessões rodam ao mesmo tempo (uma thread por sessão), cada uma com uma ação
+sorteada (mudança de período, mudança da janela de correlação ou
+exibir/ocultar a tabela paginada) sobre dados sintéticos offline. Depois do aquecimento, o crescimento do RSS deve ficar abaixo de
+`--limite-mb`; caso contrário o script termina com código 1.
+
+Uso: python -m benchmarks.soak_sessoes [--sessoes 20] [--rodadas 10] [--limite-mb 150]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.comum import ROOT, criar_fixtures, write_results
+from petroleo.correlacao import JANELAS
+from petroleo.memoria import rss_bytes
+
+PAGINA = str(ROOT / "pages" / "3_Grafico_de_Indices.py")
+
+
+def interagir(sessao, rng, primeira, ultima):
+    """Uma ação sorteada seguida do rerun da sessão."""
+    acao = rng.integers(0, 3)
+    if acao == 0:
+        dias = (ultima - primeira).days
+        a = int(rng.integers(0, dias))
+        b = int(rng.integers(a + 1, dias + 1))
+        sessao.slider[0].set_value((primeira + timedelta(days=a), primeira + timedelta(days=b)))
+    elif acao == 1:
+        sessao.select_slider[0].set_value(int(rng.choice(list(JANELAS))))
+    else:
+        sessao.checkbox[0].set_value(not sessao.checkbox[0].value)
+    sessao.run()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessoes", type=int, default=20)
+    parser.add_argument("--rodadas", type=int, default=10)
+    parser.add_argument("--limite-mb", type=float, default=150)
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        criar_fixtures(tmp)
+        os.environ["PETROLEO_FIXTURES"] = str(tmp)
+        os.environ["PETROLEO_DATA_DIR"] = str(tmp / "dados")
+        sys.path.insert(0, str(ROOT))
+
+        sessoes = [AppTest.from_file(PAGINA, default_timeout=60) for _ in range(args.sessoes)]
+        with ThreadPoolExecutor(max_workers=args.sessoes) as pool:
+            list(pool.map(lambda sessao: sessao.run(), sessoes))
+            primeira, ultima = sessoes[0].slider[0].value
+            base = rss_bytes()
+
+            amostras = []
+            rngs = [np.random.default_rng(i) for i in range(args.sessoes)]
+            for rodada in range(args.rodadas):
+                list(pool.map(lambda i: interagir(sessoes[i], rngs[i], primeira, ultima), range(args.sessoes)))
+                amostras.append((rss_bytes() - base) / 1024 ** 2)
+                print(f"rodada {rodada + 1:3d}: +{amostras[-1]:.1f} MB desde o aquecimento")
+
+    crescimento = max(amostras)
+    write_results("soak_sessoes", [{"sessoes": args.sessoes, "rodadas": args.rodadas,
+                                    "crescimento_mb": amostras, "limite_mb": args.limite_mb}])
+    if crescimento > args.limite_mb:
+        print(f"FALHA: RSS cresceu {crescimento:.1f} MB (limite {args.limite_mb} MB)")
+        sys.exit(1)
+    print(f"OK: crescimento máximo de {crescimento:.1f} MB com {args.sessoes} sessões")
+
+
+if __name__ == "__main__":
+    main()
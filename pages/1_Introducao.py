@@ -1,4 +1,6 @@
 import streamlit as st
+from petroleo.imagens import show_image
+from petroleo.telemetria import track_run
 
 # Configurar o título da página e o ícone
 st.set_page_config(
@@ -8,6 +10,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Estado inicial da barra lateral
 )
 
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("introducao")
+
 # Estilização personalizada com uma linha sublinhada na cor da FIAP
 def barra_titulo(titulo):
     st.markdown(f"""
@@ -31,7 +36,8 @@ No período de **2006** a **2025**, esses preços foram formados por importantes
 
 Este trabalho desenvolve um dashboard interativo e um modelo preditivo para estimar os preços futuros do petróleo, utilizando dados históricos e técnicas de aprendizado de máquina. A aplicação foi implementada no **Streamlit**, proporcionando aos usuários uma experiência interativa e prática.
 """)
-    st.image("img_IA.png", caption="Fonte: Imagem gerada por IA (DALL·E 3)", use_container_width=True)
+    # Imagem acima da dobra: variante responsiva carregada de imediato
+    show_image("img_IA.png", caption="Fonte: Imagem gerada por IA (DALL·E 3)", lazy=False)
 
 def objetivo():
     barra_titulo("Objetivos do Estudo")
@@ -1,5 +1,9 @@
 import streamlit as st
 import pandas as pd
+from petroleo.armazenamento import default_store
+from petroleo.eventos import EVENTOS, StoreAnalytics, format_br, format_usd
+from petroleo.imagens import show_image
+from petroleo.telemetria import cached, track_run
 
 # Configurar o título da página e o ícone
 st.set_page_config(
@@ -9,6 +13,63 @@ st.set_page_config(
     initial_sidebar_state="expanded"  
 )
 
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("exploracao")
+
+# ---- MÉTRICAS CALCULADAS A PARTIR DA SÉRIE DO BRENT ----
+# Estatísticas por ano e por evento compartilhadas entre as sessões; `refresh` só incorpora pregões novos
+@cached("eventos", st.cache_resource)
+def get_analytics():
+    return StoreAnalytics(default_store())
+
+def calcular_indicadores(analytics):
+    geral = analytics.overall()
+    eventos = {e.nome: analytics.window(e.inicio, e.fim) for e in EVENTOS}
+    anos = analytics.yearly().set_index("Ano")
+    pre_covid = analytics.window(analytics.datas[0], "2019-12-31")
+    altas = [s.variacao for s in eventos.values() if s is not None and s.variacao > 0]
+    primavera = eventos["Primavera Árabe"]
+    pre_primavera = analytics.previous_window(primavera.inicio, primavera.fim)
+
+    def quando(data):
+        evento = analytics.event_of(data)
+        return f"durante {evento}" if evento else f"em {data:%m/%Y}"
+
+    return {
+        "maximo": format_usd(geral.maximo), "maximo_quando": f"📈 {quando(geral.data_maximo)}",
+        "media": format_usd(geral.media),
+        "minimo": format_usd(geral.minimo), "minimo_quando": f"📉 {quando(geral.data_minimo)}",
+        "aumento_crises": format_usd(sum(altas) / len(altas), sinal=True) if altas else "—",
+        "queda_2015": f"{format_br(anos.loc[2015, 'Variação (%)'], 1, sinal=True)}%",
+        "queda_covid": format_usd(eventos["COVID-19"].variacao, sinal=True),
+        "maximo_pre_covid": format_usd(pre_covid.maximo),
+        "queda_2014_2020": format_usd(anos.loc[2020, "Média"] - anos.loc[2014, "Média"], sinal=True),
+        "primavera_maximo": format_usd(primavera.maximo),
+        "primavera_media": format_usd(primavera.media),
+        "primavera_minimo": format_usd(primavera.minimo),
+        # Números citados no texto dos insights
+        "covid_minimo": format_usd(eventos["COVID-19"].minimo),
+        "subprime_variacao": format_usd(eventos["Subprime 2008"].variacao, sinal=True),
+        "primavera_variacao": format_usd(primavera.variacao, sinal=True),
+        "crise2014_variacao": format_usd(eventos["Crise de 2014"].variacao, sinal=True),
+        "russia_variacao": format_usd(eventos["Rússia 2022"].variacao, sinal=True),
+        "pre_primavera_media": format_usd(pre_primavera.media),
+        "primavera_media_pct": f"{format_br(primavera.variacao_pct, 1, sinal=True)}%",
+        "pre_primavera_minimo": format_usd(pre_primavera.minimo),
+        "primavera_minimo_pct": f"{format_br((primavera.minimo / pre_primavera.minimo - 1) * 100, 1, sinal=True)}%",
+    }
+
+try:
+    analytics = get_analytics().refresh()
+    indicadores = calcular_indicadores(analytics)
+except Exception as exc:
+    analytics = None
+    indicadores = {}
+    st.warning(f"Não foi possível calcular as métricas com os dados atuais do Brent ({type(exc).__name__}).")
+
+def indicador(nome):
+    return indicadores.get(nome, "—")
+
 # Título principal da página
 st.markdown("""<h2 class="main-title">📊 Exploração de Dados e Insights</h2>""", unsafe_allow_html=True)
 
@@ -32,14 +93,14 @@ with st.expander("Insight 1: 🌍 Histórico e grandes crises (longo prazo e ten
 
     """)
 
-    st.image("analise_petroleo_media_preco_por_ano.jpg", caption="Dashboard de Preço Médio do Petróleo por Ano",  use_container_width=True)
+    show_image("analise_petroleo_media_preco_por_ano.jpg", caption="Dashboard de Preço Médio do Petróleo por Ano")
     
     st.markdown("""
     ### **Descoberta Principal**
     Ao analisarmos os dados do dashboard, identificamos que os anos com maiores elevações no preço médio do petróleo estão diretamente relacionados a eventos críticos.
     """)
 
-    st.markdown("""
+    st.markdown(f"""
     ### **Fatores-Chave Identificados**
     - **Crise Subprime (2008):** Iniciada no mercado imobiliário dos EUA, essa crise global gerou instabilidade econômica mundial, afetando o consumo de energia e causando volatilidade nos preços de commodities.
     
@@ -47,7 +108,7 @@ with st.expander("Insight 1: 🌍 Histórico e grandes crises (longo prazo e ten
     
     - **Crise Econômica de 2014:** A desaceleração global e políticas econômicas desfavoráveis na China e Europa reduziram a demanda por petróleo. O excesso de oferta intensificou a queda nos preços, resultando em uma das maiores desvalorizações do período.
 
-    - **COVID-19 (2020):** A pandemia resultou em uma queda drástica na demanda global por petróleo, especialmente no setor de transporte e indústrias. Isso causou um acúmulo de estoques e queda nos preços, com o menor preço médio do período registrado em **9,12 USD/barril**.
+    - **COVID-19 (2020):** A pandemia resultou em uma queda drástica na demanda global por petróleo, especialmente no setor de transporte e indústrias. Isso causou um acúmulo de estoques e queda nos preços, com o menor preço do período registrado em **{indicador("covid_minimo")}**.
          
     - **Guerra da Rússia e Crise Energética (2022):** Com a invasão da Ucrânia, houve um choque no fornecimento global de petróleo, resultando no maior preço médio desde 2008.
     """)
@@ -59,9 +120,16 @@ with st.expander("Insight 1: 🌍 Histórico e grandes crises (longo prazo e ten
 
     # Métricas específicas
     col1, col2, col3 = st.columns(3)
-    col1.metric(label="Maior Preço Registrado", value="143,95 USD/barril", delta="📈 durante Primavera Árabe")
-    col2.metric(label="Preço Médio", value="77,62 USD/barril")
-    col3.metric(label="Menor Preço", value="9,12 USD/barril", delta="📉 na COVID-19")
+    col1.metric(label="Maior Preço Registrado", value=indicador("maximo"), delta=indicadores.get("maximo_quando"))
+    col2.metric(label="Preço Médio", value=indicador("media"))
+    col3.metric(label="Menor Preço", value=indicador("minimo"), delta=indicadores.get("minimo_quando"))
+
+    if analytics is not None:
+        st.markdown("###### Janelas de eventos (variação em relação à janela anterior de mesmo tamanho)")
+        st.dataframe(analytics.events(), hide_index=True, use_container_width=True, column_config={
+            col: st.column_config.NumberColumn(format="%.2f")
+            for col in ["Média", "Mínimo", "Máximo", "Variação", "Variação (%)"]
+        })
 
     st.markdown("""
     ### **Conclusão**
@@ -76,24 +144,24 @@ with st.expander("Insight 2: 📈 Impacto imediato de eventos geopolíticos (dis
     O preço do petróleo é extremamente sensível a eventos externos e internos, e nossa análise revelou que os maiores aumentos no preço médio estão associados a crises geopolíticas, instabilidade regional e decisões estratégicas de grandes players, como a Organização dos Países Exportadores de Petróleo (OPEP). Esses eventos atuam como catalisadores, criando desequilíbrios na oferta e na demanda, o que resulta em picos nos preços.
     """)
 
-    st.image("analise_petroleo_influencia_aumento_preco.jpg", caption="Influência no Aumento do Preço do Petróleo",use_container_width=True)
+    show_image("analise_petroleo_influencia_aumento_preco.jpg", caption="Influência no Aumento do Preço do Petróleo")
 
-    st.markdown("""
+    st.markdown(f"""
     ### **Descoberta Principal**
-    O evento com maior influência no aumento do preço médio foi a **Primavera Árabe (2011-2012)**, com um aumento médio de 35,75 USD/barril. Esse período foi marcado por forte instabilidade no Oriente Médio, resultando na interrupção da produção em diversos países-chave. Outros eventos, como as decisões estratégicas da **OPEP** e a **Guerra da Rússia e Crise Energética**, também tiveram um impacto significativo no aumento dos preços.
+    O evento com maior influência no aumento do preço médio foi a **Primavera Árabe (2011-2012)**, com um aumento médio de {indicador("primavera_variacao")} em relação aos dois anos anteriores. Esse período foi marcado por forte instabilidade no Oriente Médio, resultando na interrupção da produção em diversos países-chave. Outros eventos, como as decisões estratégicas da **OPEP** e a **Guerra da Rússia e Crise Energética**, também tiveram um impacto significativo no aumento dos preços.
   """)
 
-    st.markdown("""
+    st.markdown(f"""
     ### **Fatores-Chave Identificados**
-    - **Primavera Árabe (2011-2012) - +35,75 USD/barril:** A instabilidade política e social no Oriente Médio, região responsável por grande parte da produção global, gerou uma crise de oferta, elevando os preços rapidamente.
+    - **Primavera Árabe (2011-2012) - {indicador("primavera_variacao")}:** A instabilidade política e social no Oriente Médio, região responsável por grande parte da produção global, gerou uma crise de oferta, elevando os preços rapidamente.
  
-    - **OPEP (2013) - +32,84 USD/barril:** As decisões da OPEP de limitar a produção foram fundamentais para sustentar os preços, especialmente em um cenário de alta demanda global.
+    - **OPEP (2013):** As decisões da OPEP de limitar a produção foram fundamentais para sustentar os preços, especialmente em um cenário de alta demanda global.
 
-    - **Guerra da Rússia e Crise Energética (2022) - +24,26 USD/barril:** A invasão russa na Ucrânia afetou diretamente o fornecimento de petróleo na Europa, levando a uma corrida por fontes alternativas de energia e pressionando os preços para cima.
+    - **Guerra da Rússia e Crise Energética (2022) - {indicador("russia_variacao")}:** A invasão russa na Ucrânia afetou diretamente o fornecimento de petróleo na Europa, levando a uma corrida por fontes alternativas de energia e pressionando os preços para cima.
 
-    - **Fatores externos diversos (entre 2006 e 2015) - +16,01 USD/barril:** Eventos como sanções econômicas e tensões em áreas produtoras criaram desequilíbrios que influenciaram aumentos moderados.
+    - **Fatores externos diversos (entre 2006 e 2015):** Eventos como sanções econômicas e tensões em áreas produtoras criaram desequilíbrios que influenciaram aumentos moderados.
 
-    - **Crise Subprime (2008) - +8,18 USD/barril:** Embora tenha resultado em quedas subsequentes, os efeitos iniciais da crise geraram picos nos preços devido à volatilidade e incertezas no mercado.
+    - **Crise Subprime (2008) - {indicador("subprime_variacao")}:** Embora tenha resultado em quedas subsequentes, os efeitos iniciais da crise geraram picos nos preços devido à volatilidade e incertezas no mercado.
     """)
 
     st.markdown("""
@@ -101,8 +169,8 @@ with st.expander("Insight 2: 📈 Impacto imediato de eventos geopolíticos (dis
     """)
 
     col1, col2 = st.columns(2)
-    col1.metric(label="Aumento Médio em Crises", value="+27,5 USD/barril")
-    col2.metric(label="Queda Pós-Crise (2015)", value="-22,3%")
+    col1.metric(label="Aumento Médio em Crises", value=indicador("aumento_crises"))
+    col2.metric(label="Queda Pós-Crise (2015)", value=indicador("queda_2015"))
 
     st.markdown("""
     ### **Conclusão**
@@ -118,24 +186,24 @@ with st.expander("Insight 3: 📉 Quedas abruptas devido a choques econômicos e
     Enquanto fatores como crises geopolíticas e restrições de oferta elevam o preço do petróleo, a análise mostrou que eventos econômicos e crises sanitárias podem criar cenários de queda acentuada nos preços. Essas quedas ocorrem, principalmente, quando há redução drástica na demanda global, seja devido a recessões econômicas ou paralisações generalizadas, como observado durante a pandemia da COVID-19.    
     """)
  
-    st.image("analise_petroleo_influencia_diminuicao_preco.jpg", caption="Influência na Diminuição do Preço do Petróleo",use_container_width=True)
+    show_image("analise_petroleo_influencia_diminuicao_preco.jpg", caption="Influência na Diminuição do Preço do Petróleo")
 
     # Descoberta principal
-    st.markdown("""
+    st.markdown(f"""
     ### **Descoberta Principal**
-    O evento que mais influenciou a redução no preço médio do petróleo foi a **Crise causada pela COVID-19 (2020-2021)**, resultando em uma queda média de 23,35 USD/barril. Durante esse período, medidas de isolamento social e interrupções em setores como transporte e indústria levaram a uma forte redução na demanda global por petróleo. Outros fatores, como a **Crise Econômica de 2014**, também foram responsáveis por quedas significativas.
+    O evento que mais influenciou a redução no preço médio do petróleo foi a **Crise causada pela COVID-19 (2020-2021)**, resultando em uma variação média de {indicador("queda_covid")}. Durante esse período, medidas de isolamento social e interrupções em setores como transporte e indústria levaram a uma forte redução na demanda global por petróleo. Outros fatores, como a **Crise Econômica de 2014**, também foram responsáveis por quedas significativas.
     """)
 
     # Fatores-Chave Identificados
-    st.markdown("""
+    st.markdown(f"""
     ### **Fatores-Chave Identificados**
-    - **Crise causada pela COVID-19,  -23,35 USD/barril:** A pandemia provocou a maior queda recente no preço do petróleo devido à desaceleração global e à queda na demanda por transporte e produção industrial. O acúmulo de estoques também pressionou os preços para baixo.
+    - **Crise causada pela COVID-19,  {indicador("queda_covid")}:** A pandemia provocou a maior queda recente no preço do petróleo devido à desaceleração global e à queda na demanda por transporte e produção industrial. O acúmulo de estoques também pressionou os preços para baixo.
 
-    - **Crise Econômica de 2014,  -15,31 USD/barril:** A combinação de uma oferta elevada e a desaceleração econômica global, especialmente em países emergentes, levou a um excesso de petróleo no mercado e a quedas acentuadas nos preços.
+    - **Crise Econômica de 2014,  {indicador("crise2014_variacao")}:** A combinação de uma oferta elevada e a desaceleração econômica global, especialmente em países emergentes, levou a um excesso de petróleo no mercado e a quedas acentuadas nos preços.
 
-    - **Fatores internos e externos (2015-2020) - -14,5 USD/barril:** Decisões internas relacionadas à produção excessiva, aliadas a contextos externos, contribuíram para quedas moderadas e prolongadas no preço do petróleo.
+    - **Fatores internos e externos (2015-2020):** Decisões internas relacionadas à produção excessiva, aliadas a contextos externos, contribuíram para quedas moderadas e prolongadas no preço do petróleo.
 
-    - **Outros fatores (Em branco),  -5,84 USD/barril:** Embora menores, fatores adicionais não especificados no gráfico também contribuíram para quedas sazonais, possivelmente relacionadas a ciclos de oferta e demanda.
+    - **Outros fatores:** Embora menores, fatores adicionais não especificados no gráfico também contribuíram para quedas sazonais, possivelmente relacionadas a ciclos de oferta e demanda.
     """)
 
     st.markdown("""
@@ -144,9 +212,9 @@ with st.expander("Insight 3: 📉 Quedas abruptas devido a choques econômicos e
 
     # Métricas específicas
     col1, col2, col3 = st.columns(3)
-    col1.metric(label="Queda Média Durante a COVID-19", value="-23,35 USD/barril")
-    col2.metric(label="Maior Preço Pré-COVID", value="143,95 USD/barril")
-    col3.metric(label="Queda Acumulada (2014-2020)", value="-15,31 USD/barril")
+    col1.metric(label="Queda Média Durante a COVID-19", value=indicador("queda_covid"))
+    col2.metric(label="Maior Preço Pré-COVID", value=indicador("maximo_pre_covid"))
+    col3.metric(label="Queda Acumulada (2014-2020)", value=indicador("queda_2014_2020"))
 
     st.markdown("""
     ### **Conclusão**
@@ -162,12 +230,12 @@ with st.expander("Insight 4: 🛢️ Primavera Árabe: Um evento regional com im
     A Primavera Árabe, ocorrida entre 2011 e 2012, foi um período de forte instabilidade política em diversos países do Oriente Médio e Norte da África, uma região responsável por uma grande parcela da produção global de petróleo. Com a eclosão de conflitos, especialmente na Líbia, houve uma drástica redução na oferta de petróleo, criando um cenário de alta volatilidade nos preços.
     """)
  
-    st.image("analise_petroleo_media_preco_primavera_arabe.jpg", caption="Média de Preço durante a Primavera Árabe", use_container_width=True)
+    show_image("analise_petroleo_media_preco_primavera_arabe.jpg", caption="Média de Preço durante a Primavera Árabe")
 
     # Descoberta principal
-    st.markdown("""
+    st.markdown(f"""
     ### **Descoberta Principal**
-    Durante o período da Primavera Árabe, o preço médio do petróleo saltou de **77,62 USD/barril** (antes da crise) para **111,50 USD/barril**, representando um aumento de **+43,6%**. A guerra civil na Líbia, que interrompeu grande parte da produção do país, foi um dos fatores centrais para essa elevação. Ao mesmo tempo, o menor preço observado no período subiu drasticamente de **9,12 USD/barril** para **88,69 USD/barril**, uma alta de impressionantes **+872%**.
+    Durante o período da Primavera Árabe, o preço médio do petróleo saltou de **{indicador("pre_primavera_media")}** (antes da crise) para **{indicador("primavera_media")}**, representando um aumento de **{indicador("primavera_media_pct")}**. A guerra civil na Líbia, que interrompeu grande parte da produção do país, foi um dos fatores centrais para essa elevação. Ao mesmo tempo, o menor preço observado no período subiu de **{indicador("pre_primavera_minimo")}** para **{indicador("primavera_minimo")}**, uma alta de **{indicador("primavera_minimo_pct")}**.
     """)
 
     # Fatores-Chave Identificados
@@ -186,9 +254,9 @@ with st.expander("Insight 4: 🛢️ Primavera Árabe: Um evento regional com im
 
     # Métricas específicas
     col1, col2, col3 = st.columns(3)
-    col1.metric(label="Maior Preço", value="128,14 USD/barril")
-    col2.metric(label="Preço Médio", value="111,50 USD/barril")
-    col3.metric(label="Menor Preço", value="88,69 USD/barril")
+    col1.metric(label="Maior Preço", value=indicador("primavera_maximo"))
+    col2.metric(label="Preço Médio", value=indicador("primavera_media"))
+    col3.metric(label="Menor Preço", value=indicador("primavera_minimo"))
 
     # Conclusão
     st.markdown("""
@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import yfinance as yf
+from petroleo.armazenamento import default_store
+from petroleo.coleta import fetch_all
+from petroleo.correlacao import JANELAS, CorrelationEngine, lag_limit
+from petroleo.esquema import display
+from petroleo.graficos import correlation_heatmap, relative_chart, rolling_correlation_chart
+from petroleo.indices import TICKERS, load_indices
+from petroleo.memoria import memory_report
+from petroleo.telemetria import cached, track_run
 
 # Configurar o título da página e o ícone
 st.set_page_config(
@@ -11,6 +17,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Estado inicial da barra lateral
 )
 
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("indices")
+
 st.markdown("""
     <style>
         .st-info-box {
@@ -28,54 +37,25 @@ st.markdown("""
 st.markdown("""<h2 class="main-title"> 📈Variação Relativa do Petróleo e Outros Índices</h2>""", unsafe_allow_html=True)
 
 # ---- FUNÇÃO PARA OBTER DADOS ----
-@st.cache_data
+# Recurso compartilhado (somente leitura) entre as sessões: st.cache_data copiaria o quadro a cada acesso
+@cached("get_data", st.cache_resource)
 def get_data():
-    # Baixar os dados do petróleo
-    df = yf.Ticker("BZ=F").history(period="max", interval="1d").reset_index()
-    df['Date'] = df['Date'].dt.tz_localize(None)
-    df.rename(columns={'Close': 'Preço - petróleo bruto (Brent) - em dólares'}, inplace=True)
-    df = df[['Date', 'Preço - petróleo bruto (Brent) - em dólares']]
-
-    # Baixar os dados do S&P 500
-    sp500 = yf.Ticker("^GSPC").history(period="max", interval="1d").reset_index()
-    sp500['Date'] = sp500['Date'].dt.tz_localize(None)
-
-    # Baixar os dados do ouro
-    gold = yf.Ticker("IAU").history(period="max", interval="1d").reset_index()
-    gold['Date'] = gold['Date'].dt.tz_localize(None)
-
-    # Baixar o Índice DXY
-    dxy = yf.Ticker("DX-Y.NYB").history(period="max", interval="1d").reset_index()
-    dxy['Date'] = dxy['Date'].dt.tz_localize(None)
-
-    # Baixar os dados do TASI
-    tasi = pd.read_csv(
-        'https://raw.githubusercontent.com/ntfcamargo/Base-TECH-CHALLENGE-3/refs/heads/main/Dados%20Hist%C3%B3ricos%20-%20Tadawul%20All%20Share.csv',
-        sep=','
-    )
-    tasi.rename(columns={'Data': 'Date'}, inplace=True)
-    tasi['Date'] = pd.to_datetime(tasi['Date'])
-    tasi['Último'] = tasi['Último'].str.replace('.', '', regex=False).str.replace(',', '.', regex=False).astype(float)
-
-    # Mesclar os dados
-    base = df.merge(sp500[['Date', 'Close']], on='Date', how='left').fillna(method='ffill')
-    base.rename(columns={'Close': 'S&P500'}, inplace=True)
-
-    base = base.merge(gold[['Date', 'Close']], on='Date', how='left').fillna(method='ffill')
-    base.rename(columns={'Close': 'Gold'}, inplace=True)
+    return load_indices()
 
-    base = base.merge(dxy[['Date', 'Close']], on='Date', how='left').fillna(method='ffill')
-    base.rename(columns={'Close': 'Índice DXY'}, inplace=True)
-
-    base['Retorno Diário Petróleo'] = base['Preço - petróleo bruto (Brent) - em dólares'].pct_change().fillna(0)
-
-    basef = base[base['Date'] > '2005-12-31'].merge(tasi[['Date', 'Último']], on='Date', how='left').fillna(method='ffill')
-    basef.rename(columns={'Último': 'TASI'}, inplace=True)
+# ---- OBTENDO OS DADOS ----
+if st.button("🔄Atualizar Dados"):
+    store = default_store()
+    fetch_all({ticker: (lambda t=ticker: store.refresh(t)) for ticker in TICKERS.values()})
+    get_data.clear()
+    st.rerun()
 
-    return basef
+basef, tempos_coleta = get_data()
 
-# ---- OBTENDO OS DADOS ----
-basef = get_data()
+falhas = tempos_coleta[tempos_coleta['Erro'] != '']
+if not falhas.empty:
+    st.warning(f"Algumas fontes não puderam ser carregadas: {', '.join(falhas['Fonte'])}. O gráfico mostra apenas as séries disponíveis.")
+with st.expander("⏱️ Tempo de coleta por fonte"):
+    st.dataframe(tempos_coleta, hide_index=True)
 
 
 
@@ -121,32 +101,70 @@ st.write("""
 - **Relação**: Pode indicar mudanças na política da OPEP, afetando o preço do petróleo.
 """)
 
-# ---- NORMALIZAÇÃO DOS DADOS ----
-cols_to_normalize = ['Preço - petróleo bruto (Brent) - em dólares', 'S&P500', 'Gold', 'Índice DXY', 'TASI']
-df_normalized = basef.copy()
-df_normalized[cols_to_normalize] = basef[cols_to_normalize].apply(lambda x: x / x.iloc[0])
-
 # ---- CRIAÇÃO DO GRÁFICO ----
+cols_to_normalize = ['brent', 'sp500', 'gold', 'dxy', 'tasi']
+
+# Figura compartilhada por versão dos dados, intervalo e largura: reruns não redesenham nada
+@cached("build_chart", st.cache_resource(max_entries=32))
+def build_chart(versao, _basef, inicio, fim, pontos):
+    return relative_chart(_basef, cols_to_normalize, inicio, fim, pontos)
+
 st.header("📉 Variação Relativa das Variáveis")
-fig, ax = plt.subplots(figsize=(14, 8))
-for col in cols_to_normalize:
-    if col == 'Preço - petróleo bruto (Brent) - em dólares':
-        ax.plot(df_normalized['Date'], df_normalized[col], label=col, linewidth=2.5, color='red')
-    else:
-        ax.plot(df_normalized['Date'], df_normalized[col], label=col, linewidth=1.5, alpha=0.7)
-
-ax.set_title("Variação Relativa das Variáveis ao Longo do Tempo", fontsize=16)
-ax.set_xlabel("Ano", fontsize=14)
-ax.set_ylabel("Variação Relativa (Base 1.0)", fontsize=14)
-ax.legend(loc="upper left", fontsize=10)
-ax.grid(alpha=0.3)
+primeira_data, ultima_data = basef['Date'].iloc[0].date(), basef['Date'].iloc[-1].date()
+inicio, fim = st.slider("Período exibido (aproxime para ver mais detalhes):", min_value=primeira_data,
+                        max_value=ultima_data, value=(primeira_data, ultima_data), format="DD/MM/YYYY")
+versao = (len(basef), str(ultima_data))
+fig = build_chart(versao, basef, pd.Timestamp(inicio), pd.Timestamp(fim), pontos=1500)
 
 # Exibir o gráfico no Streamlit
-st.pyplot(fig)
+st.plotly_chart(fig, use_container_width=True)
+
+# ---- CORRELAÇÃO ENTRE OS ÍNDICES ----
+# Somas de prefixo compartilhadas entre as sessões: dias novos só estendem os prefixos,
+# e cada tamanho de janela fica em cache (trocar a janela não recalcula o histórico)
+@cached("correlacao", st.cache_resource)
+def get_correlation():
+    return CorrelationEngine(colunas=cols_to_normalize)
+
+@cached("correlation_charts", st.cache_resource(max_entries=32))
+def build_correlation_charts(versao, _correlacao, janela):
+    correlacao = _correlacao.matrix(janela)
+    pico, defasagem = _correlacao.lead_lag(janela)
+    limite = lag_limit(janela)
+    return (
+        correlation_heatmap(correlacao, f"Correlação dos retornos diários (últimos {janela} pregões)"),
+        correlation_heatmap(pico, f"Maior correlação entre -{limite} e +{limite} dias de defasagem",
+                            texto=defasagem.astype(str) + " d"),
+        rolling_correlation_chart(_correlacao.rolling(janela, base="brent")),
+    )
+
+st.header("🔗 Correlação entre o Brent e os Índices")
+st.write("""
+As relações descritas acima são medidas aqui sobre os **retornos diários** (variações percentuais), não sobre os níveis de preço,
+que tendem a parecer correlacionados apenas por compartilharem tendências de longo prazo.
+""")
+correlacao = get_correlation()
+correlacao.update(basef)
+janela = st.select_slider("Janela de cálculo:", options=list(JANELAS), value=252, format_func=JANELAS.get)
+fig_correlacao, fig_defasagem, fig_movel = build_correlation_charts(correlacao.versao, correlacao, janela)
+col1, col2 = st.columns(2)
+col1.plotly_chart(fig_correlacao, use_container_width=True)
+col2.plotly_chart(fig_defasagem, use_container_width=True)
+st.caption("Defasagem (em dias) na célula [linha, coluna]: valores positivos indicam que a série da coluna antecede a da linha.")
+st.markdown(f"###### Correlação móvel do Brent com cada índice (janela de {JANELAS[janela]})")
+st.plotly_chart(fig_movel, use_container_width=True)
 
 # ---- CHECKBOX PARA EXIBIR DADOS ----
 if st.checkbox("📋 Exibir tabela de dados"):
-    st.write(basef)
+    # Tabela paginada: só a página atual é enviada ao navegador
+    linhas_por_pagina = 100
+    paginas = max(1, -(-len(basef) // linhas_por_pagina))
+    pagina = st.number_input("Página (as mais recentes estão no fim):", min_value=1, max_value=paginas, value=paginas, step=1)
+    st.dataframe(display(basef.iloc[(pagina - 1) * linhas_por_pagina:pagina * linhas_por_pagina]), hide_index=True)
+    st.caption(f"Página {pagina} de {paginas} ({len(basef)} linhas).")
+
+with st.expander("🧠 Memória do processo"):
+    st.dataframe(memory_report({"Dados compartilhados (basef)": basef}), hide_index=True)
 
 st.markdown("---")
 
@@ -1,13 +1,12 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import xgboost as xgb
-import plotly.graph_objects as go
-from sklearn.metrics import mean_squared_error, mean_absolute_error, mean_absolute_percentage_error
-from sklearn.model_selection import train_test_split
-from datetime import date, timedelta
-import yfinance as yf
-from babel.dates import format_date
+from petroleo.agendador import RefreshScheduler
+from petroleo.ajuste import TuningJob
+from petroleo.backtest import cached_backtest
+from petroleo.features import TARGET
+from petroleo.previsores import FORECASTERS, ForecastZoo
+from petroleo.servico import ForecastService, artifact_metadata, default_params
+from petroleo.telemetria import cached, track_run
 
 # Configurar o título da página e o ícone
 st.set_page_config(
@@ -17,13 +16,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"  
 )
 
-# Função para calcular métricas
-def calculate_metrics(y_true, y_pred):
-    mae = mean_absolute_error(y_true, y_pred)
-    mse = mean_squared_error(y_true, y_pred)
-    rmse = np.sqrt(mse)
-    mape = mean_absolute_percentage_error(y_true, y_pred) * 100
-    return mae, mse, rmse, mape
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("modelo")
 
 st.markdown("""
     <style>
@@ -67,72 +61,82 @@ Recomendamos previsões de curto prazo (<strong>7 a 15 dias</strong>) para maior
 """, unsafe_allow_html=True)
 st.markdown('<div class="st-observation">* As previsões estão sendo realizadas com base em dados históricos dos últimos 20 anos.</div>', unsafe_allow_html=True)
 
+# Serviço de previsão residente em memória, compartilhado por todas as sessões.
+# O agendador mantém as previsões padrão (1 a 30 dias) pré-calculadas em segundo plano.
+@cached("get_service", st.cache_resource)
+def get_service():
+    service = ForecastService()
+    return service, RefreshScheduler(service, intervalo=3600).start()
+
+service, agendador = get_service()
+
+# Busca automática de hiperparâmetros em segundo plano, uma por processo
+@cached("get_tuning", st.cache_resource)
+def get_tuning():
+    return TuningJob()
+
+def concluir_ajuste():
+    # O modelo padrão mudou: o agendador refaz as previsões pré-calculadas
+    service.reload_artifact()
+    agendador.trigger()
+basef = service.data
+DATA_INICIAL = basef.index[-1]
+
 # Entrada do usuário
 diaspred = st.slider("Selecione o número de dias futuros:", min_value=1, max_value=30, value=7, step=1)
+mostrar_intervalo = st.checkbox("Exibir intervalo de previsão de 90% (incerteza real da previsão, calculada fora da amostra)", value=False)
+
+# Parâmetros padrão: os do modelo pré-treinado que responde às previsões padrão
+# (o da busca automática, se já houver uma, senão o distribuído com o projeto)
+PARAMETROS_PADRAO = default_params()
 
 with st.expander("⚙️ Configurações Avançadas"):
-    estimadores = st.slider("Selecione o número de estimadores a ser usado (Representa o número total de árvores de decisão que serão treinadas no modelo, Um número maior pode melhorar a precisão, mas também aumenta o risco de overfitting e o tempo de treinamento.)", min_value=5, max_value=1000, value=200, step=5)
-    learning = st.slider("Selecione o learning rate a ser usado (Controla o peso de cada nova árvore ao ajustar o modelo, um learning rate baixo exige mais árvores e vice e versa.)", min_value=0.01, max_value=0.8, value=0.1, step=0.01)
-
-# Carregar dados
-@st.cache_data
-def load_data():
-    df = yf.Ticker("BZ=F").history(period="20y", interval="1d").reset_index()
-    df['Date'] = pd.to_datetime(df['Date']).dt.tz_localize(None)
-    df.rename(columns={'Close': 'Preço - petróleo bruto (Brent) - em dólares'}, inplace=True)
-    df = df[['Date', 'Preço - petróleo bruto (Brent) - em dólares']].set_index('Date').dropna()
-    return df
-
-def create_time_features(df):
-    df['Ano'] = df.index.year
-    df['Mês'] = df.index.month
-    df['Dia'] = df.index.day
-    df['Dia_Semana'] = df.index.weekday
-    df['dia_anterior'] = df["Preço - petróleo bruto (Brent) - em dólares"].shift(1).fillna(method='bfill')
-    return df
-
-df = load_data()
-basef = create_time_features(df)
-TARGET = "Preço - petróleo bruto (Brent) - em dólares"
-selected_features = ['Ano', 'Mês', 'Dia', 'Dia_Semana', 'dia_anterior']
-DATA_INICIAL = basef.index[-1]
-# Divisão de treino e validação
-x = basef[selected_features]
-y = basef[TARGET]
-x_train, x_val, y_train, y_val = train_test_split(x, y, test_size=0.2, shuffle=False)
-
-@st.cache_resource
-def train_model():
-    dtrain = xgb.DMatrix(x_train, label=y_train)
-    dval = xgb.DMatrix(x_val, label=y_val)
-    params = {
-        "objective": "reg:squarederror",
-        "learning_rate": learning,
-        "max_depth": estimadores,
-        "n_jobs": -1
-    }
-    reg = xgb.train(
-        params=params,
-        dtrain=dtrain,
-        num_boost_round=300,
-        evals=[(dval, "validation")],
-        early_stopping_rounds=10,
-        verbose_eval=False
-    )
-    return reg
+    st.caption(f"Valores iniciais = parâmetros do modelo pré-treinado em uso ({artifact_metadata().get('version', 'sem versão')}): "
+               f"{int(PARAMETROS_PADRAO['num_boost_round'])} estimadores, learning rate {PARAMETROS_PADRAO['learning_rate']}, "
+               f"profundidade {int(PARAMETROS_PADRAO['max_depth'])}.")
+    estimadores = st.slider("Selecione o número de estimadores a ser usado (Representa o número total de árvores de decisão que serão treinadas no modelo, Um número maior pode melhorar a precisão, mas também aumenta o risco de overfitting e o tempo de treinamento.)", min_value=5, max_value=1000, value=int(PARAMETROS_PADRAO["num_boost_round"]), step=5)
+    learning = st.slider("Selecione o learning rate a ser usado (Controla o peso de cada nova árvore ao ajustar o modelo, um learning rate baixo exige mais árvores e vice e versa.)", min_value=0.01, max_value=0.8, value=round(float(PARAMETROS_PADRAO["learning_rate"]), 2), step=0.01)
+    profundidade = st.slider("Selecione a profundidade máxima das árvores (Árvores mais profundas capturam interações mais complexas, mas tendem a sobreajustar.)", min_value=1, max_value=15, value=int(PARAMETROS_PADRAO["max_depth"]), step=1)
+    usar_pretreinado = st.checkbox("Usar o modelo pré-treinado quando os parâmetros estiverem no padrão (previsão imediata, sem treino)", value=True)
+    metodo_intervalo = st.radio("Método do intervalo de previsão:", ["bootstrap", "quantil"], horizontal=True,
+                                help="bootstrap: ensemble de modelos com caminhos simulados a partir dos erros fora da amostra; quantil: um modelo XGBoost com objetivo de regressão quantílica.")
+    # Sem a data de corte do treino (metadados `.json` do artefato) não há como saber quais dias são novos.
+    # Só os metadados são lidos: o modelo (joblib/xgboost) continua carregando sob demanda
+    sem_corte = not artifact_metadata().get("trained_until")
+    continuar_treino = st.checkbox("Atualizar o modelo pré-treinado com os dias mais recentes (continua o boosting apenas com os dias novos)", value=False,
+                                   disabled=sem_corte,
+                                   help="Indisponível: o modelo pré-treinado não registra até que data foi treinado. Execute o ajuste automático para gerar um modelo com essa data." if sem_corte else None)
+    ajuste = get_tuning()
+    if st.button("🎯Ajustar Hiperparâmetros Automaticamente", disabled=ajuste.running):
+        ajuste.start(basef, n_trials=40, ao_concluir=concluir_ajuste)
+        st.rerun()
+    if ajuste.running:
+        st.info("Buscando os melhores hiperparâmetros nas janelas walk-forward, em segundo plano. Recarregue a página para ver o resultado.")
+    elif ajuste.erro:
+        st.error(f"A busca automática falhou: {ajuste.erro}")
+    elif ajuste.melhores:
+        st.success(f"Busca concluída: modelo {ajuste.versao} com {ajuste.melhores} é o novo padrão.")
+
+params = {
+    "num_boost_round": estimadores,
+    "learning_rate": learning,
+    "max_depth": profundidade,
+    "subsample": PARAMETROS_PADRAO["subsample"],
+    "colsample_bytree": PARAMETROS_PADRAO["colsample_bytree"],
+}
+# Com os parâmetros padrão o serviço usa o modelo pré-treinado
+if (estimadores, learning, profundidade) == (int(PARAMETROS_PADRAO["num_boost_round"]), round(float(PARAMETROS_PADRAO["learning_rate"]), 2), int(PARAMETROS_PADRAO["max_depth"])):
+    params = None
 
 if st.button("🔄Atualizar Dados"):
-    st.cache_data.clear()
+    service.reload(refresh=True)
+    agendador.trigger()
     st.rerun()
 
 if st.button("➡️Realizar Previsão"):
-    reg = train_model()
-    last_n_days = basef.index[-diaspred:]
-    x_test, y_test = basef.loc[last_n_days, selected_features], basef.loc[last_n_days, TARGET]
-    dtest = xgb.DMatrix(x_test)
-    preds_test = reg.predict(dtest)
-    mae, mse, rmse, mape = calculate_metrics(y_test, preds_test)
-    ultimo_preco = basef[TARGET].iloc[-1]
+    previsao = service.forecast(diaspred, params, usar_pretreinado, continuar_treino)
+    mae, mse, rmse, mape = previsao.metrics
+    ultimo_preco = previsao.last_price
     confiabilidade = max(0, 100 - mape)
 
     st.markdown("""
@@ -147,16 +151,8 @@ if st.button("➡️Realizar Previsão"):
         st.markdown("###### 📊 Confiabilidade da Previsão")
         st.write(f"**{confiabilidade:.2f}%**")
 
-    future_dates = pd.date_range(start=DATA_INICIAL + timedelta(days=1), periods=diaspred, freq='D')
-    future_df = pd.DataFrame(index=future_dates)
-    future_df['Ano'] = future_dates.year
-    future_df['Mês'] = future_dates.month
-    future_df['Dia'] = future_dates.day
-    future_df['Dia_Semana'] = future_dates.weekday
-    future_df['dia_anterior'] = [ultimo_preco] + [np.nan] * (len(future_dates) - 1)
-    future_df['dia_anterior'] = future_df['dia_anterior'].ffill()
-    dfuture = xgb.DMatrix(future_df[selected_features])
-    future_df['Previsão'] = reg.predict(dfuture)
+    # Previsão recursiva: cada dia previsto alimenta o 'dia_anterior' do dia seguinte
+    future_df = previsao.to_frame()
 
     df_plot = pd.DataFrame({
         'Data': list(basef.index[-30:]) + list(future_df.index),
@@ -169,7 +165,9 @@ if st.button("➡️Realizar Previsão"):
     # Ponto de transição (último dia real)
     data_transicao = basef.index[-1]
 
-    # Criar o gráfico
+    # Criar o gráfico (plotly só é importado quando há uma previsão para desenhar)
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     # Adicionar dados reais e previsão
@@ -188,6 +186,28 @@ if st.button("➡️Realizar Previsão"):
     line=dict(color='#F4D03F')  # Amarelo ouro suave
 ))
 
+    # Faixa do intervalo de previsão
+    if mostrar_intervalo:
+        with st.spinner("Calculando o intervalo de previsão..."):
+            intervalo = service.intervals(diaspred, metodo_intervalo, 0.9, params, usar_pretreinado, continuar_treino)
+        fig.add_trace(go.Scatter(
+        x=intervalo.dates,
+        y=intervalo.upper,
+        mode='lines',
+        line=dict(width=0),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+        fig.add_trace(go.Scatter(
+        x=intervalo.dates,
+        y=intervalo.lower,
+        mode='lines',
+        line=dict(width=0),
+        fill='tonexty',
+        fillcolor='rgba(244, 208, 63, 0.2)',
+        name=f'Intervalo de {intervalo.nivel:.0%} ({intervalo.metodo})'
+    ))
+
     # Adicionar linha vertical de transição com a cor da FIAP
     fig.add_shape(
     type='line',
@@ -227,6 +247,9 @@ if st.button("➡️Realizar Previsão"):
     st.subheader("Previsões Futuras")
     st.dataframe(future_df[['Previsão']].reset_index().rename(columns={'index': 'Data'}))
     st.success("✅ Previsão concluída com sucesso!")
+    stats = service.registry.stats()
+    st.caption(f"Modelo: {previsao.origem}. Cache de modelos: {stats.hits} acertos, {stats.misses} treinos, {stats.items} modelos em memória "
+               f"({stats.bytes / 1024 ** 2:.1f} MB), {stats.saved_seconds:.1f}s de treino economizados.")
     st.subheader("Confira também: ")
     with st.expander("📋 Explicação das Métricas"):
         st.write("""
@@ -260,6 +283,59 @@ if st.button("➡️Realizar Previsão"):
         ⚠️ **Importante:** O MAPE é uma métrica complementar à confiabilidade. Sempre verifique o contexto dos dados para interpretar as previsões corretamente.
         """)
 
+# ---- COMPARAÇÃO DE MODELOS ----
+# Ajustes compartilhados entre as sessões e guardados por versão dos dados
+@cached("get_zoo", st.cache_resource)
+def get_zoo():
+    return ForecastZoo()
+
+with st.expander("🧩 Comparar modelos (XGBoost, ARIMA, ETS e Prophet)"):
+    st.write(f"""
+    Os modelos são ajustados em paralelo, cada um com um tempo máximo; quem não termina a tempo fica de fora.
+    O **Ensemble** combina as previsões com pesos proporcionais ao inverso do erro (MAE) de cada modelo
+    nos últimos 30 pregões, que ficam fora do ajuste usado para medir esse erro. Horizonte: **{diaspred}** pregões.
+    """)
+    modelos = st.multiselect("Modelos:", list(FORECASTERS), default=list(FORECASTERS))
+    if modelos and st.button("⚖️Comparar Modelos"):
+        with st.spinner("Ajustando os modelos em paralelo..."):
+            comparacao = get_zoo().run(basef[TARGET], diaspred, modelos, versao=service.version)
+        import plotly.graph_objects as go
+
+        fig_modelos = go.Figure()
+        fig_modelos.add_trace(go.Scatter(x=basef.index[-30:], y=basef[TARGET].iloc[-30:], mode='lines',
+                                         name='Dados Reais', line=dict(color='#5DADE2')))
+        for nome in comparacao.previsoes.columns:
+            ensemble = nome == "Ensemble"
+            fig_modelos.add_trace(go.Scatter(x=comparacao.dates, y=comparacao.previsoes[nome], mode='lines+markers',
+                                             name=nome, line=dict(width=3 if ensemble else 1.5,
+                                                                  color="#FF0055" if ensemble else None)))
+        fig_modelos.update_layout(title="Previsão por modelo e ensemble", xaxis_title="Data",
+                                  yaxis_title="Preço (em dólares)", showlegend=True)
+        st.plotly_chart(fig_modelos, use_container_width=True)
+        st.dataframe(comparacao.summary(), hide_index=True)
+
+# ---- BACKTEST WALK-FORWARD ----
+with st.expander("🧪 Backtest walk-forward (avaliação fora da amostra)"):
+    st.write(f"""
+    O modelo é treinado repetidamente com todo o histórico até uma data de corte e prevê os **{diaspred}** pregões seguintes,
+    que nunca entram no treino. As métricas são mostradas por janela de teste e por horizonte de previsão.
+    """)
+    n_folds = st.slider("Número de janelas de teste:", min_value=5, max_value=200, value=20, step=5)
+    if st.button("▶️Executar Backtest"):
+        params_backtest = {"objective": "reg:squarederror", "learning_rate": learning, "max_depth": profundidade,
+                           "subsample": PARAMETROS_PADRAO["subsample"], "colsample_bytree": PARAMETROS_PADRAO["colsample_bytree"]}
+        with st.spinner("Executando backtest..."):
+            try:
+                resultado = cached_backtest(basef, params_backtest, n_folds=n_folds, horizonte=diaspred, num_boost_round=estimadores)
+            except TimeoutError as exc:
+                st.error(f"O backtest foi interrompido ({exc}). Tente com menos janelas de teste.")
+                st.stop()
+        st.markdown("###### Erro por horizonte")
+        st.line_chart(resultado.horizons.set_index("Horizonte")[["MAE", "RMSE"]])
+        st.dataframe(resultado.horizons, hide_index=True)
+        st.markdown("###### Erro por janela de teste")
+        st.dataframe(resultado.folds, hide_index=True)
+
     # Rodapé estilizado
 st.markdown("""
 <div style="text-align: center; margin-top: 30px; color: #999;">
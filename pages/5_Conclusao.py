@@ -1,4 +1,5 @@
 import streamlit as st
+from petroleo.telemetria import track_run
 
 # Configurar o título da página e o ícone
 st.set_page_config(
@@ -8,6 +9,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Estado inicial da barra lateral
 )
 
+# Telemetria: reruns da sessão e bytes enviados ao navegador
+track_run("conclusao")
+
 # Estilização personalizada com uma linha sublinhada na cor da FIAP
 def barra_titulo(titulo):
     st.markdown(f"""
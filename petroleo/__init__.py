@@ -0,0 +1 @@
+"""Camada de dados e modelagem compartilhada pelas páginas do dashboard."""
@@ -0,0 +1,57 @@
+"""Agendador em segundo plano que mantém as previsões padrão pré-calculadas.
+
+A cada `intervalo` segundos busca pregões novos no armazenamento de preços.
+Quando os dados (ou o modelo pré-treinado) mudam, recalcula as previsões de
+1 a 30 dias. As sessões da página passam a fazer só uma consulta.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    def __init__(self, service, intervalo=3600, refresh=True):
+        self.service = service
+        self.intervalo = intervalo
+        self.refresh = refresh
+        self.ultima_chave = None
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="agendador-previsoes")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._parar.set()
+        self._acordar.set()
+
+    def trigger(self):
+        """Força uma rodada imediata (ex.: após o botão "Atualizar Dados")."""
+        self._acordar.set()
+
+    def run_once(self, refresh=None):
+        refresh = self.refresh if refresh is None else refresh
+        if refresh:
+            try:
+                self.service.reload(refresh=True)
+            except Exception:
+                logger.exception("Falha ao atualizar os preços; mantendo os dados atuais")
+        chave = self.service.precompute_key()
+        if chave != self.ultima_chave or not self.service.has_precomputed():
+            self.ultima_chave = self.service.precompute()
+        return self.ultima_chave
+
+    def _loop(self):
+        # Primeira rodada sem rede: o pré-cálculo com os dados locais fica pronto o quanto antes
+        refresh = False
+        while not self._parar.is_set():
+            try:
+                self.run_once(refresh=refresh)
+            except Exception:
+                logger.exception("Falha ao pré-calcular as previsões")
+            refresh = self.refresh
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
@@ -0,0 +1,230 @@
+"""Busca automática de hiperparâmetros sobre as janelas walk-forward.
+
+Os trials rodam em paralelo em um pool de processos. Dentro de cada janela,
+o treino usa early stopping e um callback de poda que compara a métrica de
+validação com a mediana dos outros trials no mesmo ponto (janela, rodada).
+Trials claramente piores são interrompidos cedo. A melhor configuração é
+gravada em disco e vira o padrão da página de previsão.
+
+Os processos são criados por spawn e ocupam vagas do agendador de treino
+(por padrão todas menos uma, para a página continuar treinando). Na página,
+a busca roda em segundo plano (`TuningJob`), sem bloquear a sessão.
+
+Uso: python -m petroleo.ajuste [n_trials]
+"""
+import json
+import logging
+import math
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petroleo.armazenamento import DATA_DIR
+from petroleo.backtest import walk_forward_splits
+from petroleo.features import SELECTED_FEATURES, TARGET
+from petroleo.treino import default_scheduler, spawn_context
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = DATA_DIR / "melhores_parametros.json"
+TUNED_ARTIFACT_PATH = DATA_DIR / "xgb_model_ajustado.joblib"
+
+SEARCH_SPACE = {
+    "max_depth": (2, 10),
+    "learning_rate": (0.01, 0.3),
+    "num_boost_round": (100, 1000),
+    "subsample": (0.5, 1.0),
+    "colsample_bytree": (0.5, 1.0),
+}
+CHECKPOINT = 25  # rodadas entre relatórios ao podador
+MIN_TRIALS = 5  # trials completos antes de começar a podar
+
+
+def sample_params(rng):
+    return {
+        "max_depth": int(rng.integers(SEARCH_SPACE["max_depth"][0], SEARCH_SPACE["max_depth"][1] + 1)),
+        "learning_rate": float(math.exp(rng.uniform(*np.log(SEARCH_SPACE["learning_rate"])))),
+        "num_boost_round": int(rng.integers(*SEARCH_SPACE["num_boost_round"]) // 50 * 50),
+        "subsample": round(float(rng.uniform(*SEARCH_SPACE["subsample"])), 2),
+        "colsample_bytree": round(float(rng.uniform(*SEARCH_SPACE["colsample_bytree"])), 2),
+    }
+
+
+class TrialPruned(Exception):
+    pass
+
+
+def _report(relatorios, lock, chave, valor):
+    """Registra `valor` em `chave` e indica se ele é pior que a mediana dos demais trials."""
+    with lock:
+        anteriores = list(relatorios.get(chave, []))
+        relatorios[chave] = anteriores + [valor]
+    return len(anteriores) >= MIN_TRIALS and valor > float(np.median(anteriores))
+
+
+def _pruning_callback(relatorios, lock, janela):
+    import xgboost as xgb
+
+    class PruningCallback(xgb.callback.TrainingCallback):
+        def after_iteration(self, model, epoch, evals_log):
+            if epoch == 0 or epoch % CHECKPOINT:
+                return False
+            rmse = evals_log["validation"]["rmse"][-1]
+            if _report(relatorios, lock, f"{janela}:{epoch}", rmse):
+                raise TrialPruned()
+            return False
+
+    return PruningCallback()
+
+
+def _trial(args):
+    import xgboost as xgb
+
+    params, X, y, cortes, val_size, relatorios, lock, nthread = args
+    num_boost_round = params["num_boost_round"]
+    xgb_params = {"objective": "reg:squarederror", "tree_method": "hist", "nthread": nthread,
+                  **{k: v for k, v in params.items() if k != "num_boost_round"}}
+    scores, rodadas = [], []
+    try:
+        for janela, corte in enumerate(cortes):
+            dtrain = xgb.QuantileDMatrix(X[:corte], label=y[:corte], feature_names=SELECTED_FEATURES,
+                                         nthread=nthread)
+            # A validação reaproveita os cortes de histograma do treino
+            dval = xgb.QuantileDMatrix(X[corte:corte + val_size], label=y[corte:corte + val_size],
+                                       feature_names=SELECTED_FEATURES, ref=dtrain, nthread=nthread)
+            booster = xgb.train(xgb_params, dtrain, num_boost_round=num_boost_round,
+                                evals=[(dval, "validation")], early_stopping_rounds=20, verbose_eval=False,
+                                callbacks=[_pruning_callback(relatorios, lock, janela)])
+            scores.append(booster.best_score)
+            rodadas.append(booster.best_iteration + 1)
+            if _report(relatorios, lock, f"{janela}:final", float(np.mean(scores))):
+                raise TrialPruned()
+    except TrialPruned:
+        return {**params, "rmse": float(np.mean(scores)) if scores else float("inf"),
+                "janelas": len(scores), "podado": True, "rodadas_usadas": int(np.mean(rodadas)) if rodadas else 0}
+    return {**params, "rmse": float(np.mean(scores)), "janelas": len(scores), "podado": False,
+            "rodadas_usadas": int(np.mean(rodadas))}
+
+
+def tune(basef, n_trials=40, n_folds=5, val_size=63, max_workers=None, seed=0, scheduler=None):
+    """Executa a busca e devolve os trials ordenados pelo RMSE médio de validação."""
+    X = basef[SELECTED_FEATURES].to_numpy(dtype=np.float32)
+    y = basef[TARGET].to_numpy(dtype=np.float32)
+    cortes = walk_forward_splits(len(y), n_folds, val_size)
+    rng = np.random.default_rng(seed)
+
+    scheduler = scheduler or default_scheduler()
+    contexto = spawn_context()
+    with scheduler.slots(max_workers or max(1, scheduler.max_jobs - 1)) as (processos, nthread), \
+            contexto.Manager() as manager, ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+        relatorios, lock = manager.dict(), manager.Lock()
+        tarefas = [(sample_params(rng), X, y, cortes, val_size, relatorios, lock, nthread) for _ in range(n_trials)]
+        trials = list(pool.map(_trial, tarefas))
+
+    trials = pd.DataFrame(trials)
+    completos = trials[~trials["podado"]]
+    return pd.concat([completos.sort_values("rmse"), trials[trials["podado"]]], ignore_index=True)
+
+
+def best_params(trials):
+    melhor = trials[~trials["podado"]].iloc[0]
+    params = {k: melhor[k] for k in SEARCH_SPACE}
+    # O número de rodadas padrão é o que o early stopping de fato usou (múltiplo de 5, como o slider)
+    params["num_boost_round"] = int(max(5, round(melhor["rodadas_usadas"] / 5) * 5))
+    params["max_depth"] = int(params["max_depth"])
+    return {k: (v.item() if hasattr(v, "item") else v) for k, v in params.items()}
+
+
+def save_best_params(params, path=CONFIG_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(params, indent=2))
+
+
+def load_best_params(path=CONFIG_PATH):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def train_final(basef, params, path=TUNED_ARTIFACT_PATH):
+    """Treina com todo o histórico usando `params` e grava o artefato versionado."""
+    import xgboost as xgb
+
+    from petroleo.artefato import save_artifact
+    from petroleo.treino import default_scheduler
+
+    xgb_params = {"objective": "reg:squarederror",
+                  **{k: v for k, v in params.items() if k != "num_boost_round"}}
+
+    def treinar(nthread):
+        dtrain = xgb.QuantileDMatrix(basef[SELECTED_FEATURES], label=basef[TARGET], nthread=nthread)
+        return xgb.train({**xgb_params, "tree_method": "hist", "nthread": nthread}, dtrain,
+                         num_boost_round=params["num_boost_round"])
+
+    # Sem validação para parada antecipada (o número de rodadas já vem da busca), mas na fila do agendador
+    booster = default_scheduler().run(treinar)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return save_artifact(booster, basef.index[-1], params, path=path)
+
+
+class TuningJob:
+    """Busca + artefato final numa thread em segundo plano (uma por vez); a página só consulta o estado."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self.melhores = None
+        self.versao = None
+        self.erro = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, basef, n_trials=40, ao_concluir=None):
+        """Inicia a busca; devolve False se já houver uma em andamento."""
+        with self._lock:
+            if self.running:
+                return False
+            self.erro = None
+            self._thread = threading.Thread(target=self._run, args=(basef, n_trials, ao_concluir), daemon=True,
+                                            name="busca-hiperparametros")
+            self._thread.start()
+            return True
+
+    def _run(self, basef, n_trials, ao_concluir):
+        try:
+            melhores = best_params(tune(basef, n_trials=n_trials))
+            save_best_params(melhores)
+            self.versao = train_final(basef, melhores)
+            self.melhores = melhores
+            if ao_concluir is not None:
+                ao_concluir()
+        except Exception as exc:
+            logger.exception("Falha na busca automática de hiperparâmetros")
+            self.erro = f"{type(exc).__name__}: {exc}"
+
+
+def main():
+    from petroleo.armazenamento import default_store
+    from petroleo.features import FeatureStore
+
+    n_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    precos = default_store().load("BZ=F").set_index("Date")["Close"].dropna()
+    basef = FeatureStore().update("BZ=F", precos)
+    basef = basef[basef.index > basef.index[-1] - pd.DateOffset(years=20)]
+
+    trials = tune(basef, n_trials=n_trials)
+    print(trials.head(10).to_string(index=False))
+    params = best_params(trials)
+    save_best_params(params)
+    versao = train_final(basef, params)
+    print(f"Melhores parâmetros gravados em {CONFIG_PATH}; artefato {versao} em {TUNED_ARTIFACT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
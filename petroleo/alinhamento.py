@@ -0,0 +1,55 @@
+"""Alinhamento de N séries diárias em uma única matriz com forward-fill.
+
+Substitui a sequência de `merge` + `ffill` (uma cópia do quadro inteiro por
+série) por uma única alocação: todas as séries são posicionadas sobre a união
+das datas e preenchidas de uma vez com NumPy.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _as_series(dados, nome):
+    if isinstance(dados, pd.Series):
+        s = dados
+    else:
+        valor = "Close" if "Close" in dados.columns else [c for c in dados.columns if c != "Date"][0]
+        s = pd.Series(dados[valor].to_numpy(), index=pd.DatetimeIndex(dados["Date"]))
+    s = s[~s.index.duplicated(keep="last")].sort_index()
+    return s.rename(nome)
+
+
+def ffill_matrix(values):
+    """Forward-fill por coluna de uma matriz 2D (NaN iniciais permanecem NaN)."""
+    linhas = np.arange(values.shape[0])[:, None]
+    pos = np.where(np.isnan(values), 0, linhas)
+    np.maximum.accumulate(pos, axis=0, out=pos)
+    return values[pos, np.arange(values.shape[1])]
+
+
+def align(series, base=None, start=None, dtype="float64"):
+    """Alinha `series` ({nome: Series ou DataFrame Date/Close}) por data.
+
+    As séries são posicionadas sobre a união das datas e preenchidas para
+    frente em uma única passada. Com `base`, o resultado é reduzido às datas
+    dessa série (equivalente ao antigo merge left + ffill, porém usando o
+    último valor conhecido mesmo em dias sem pregão da série base). Use
+    `dtype="float32"` para uma matriz compacta.
+    """
+    nomes = list(series)
+    colunas = [_as_series(series[nome], nome) for nome in nomes]
+    datas = [c.index.to_numpy(dtype="datetime64[ns]") for c in colunas]
+    indice = np.unique(np.concatenate(datas)) if datas else np.array([], dtype="datetime64[ns]")
+
+    values = np.full((len(indice), len(colunas)), np.nan, dtype=dtype)
+    for j, (coluna, d) in enumerate(zip(colunas, datas)):
+        values[np.searchsorted(indice, d), j] = coluna.to_numpy(dtype=dtype)
+    values = ffill_matrix(values)
+
+    if base is not None:
+        linhas = np.searchsorted(indice, datas[nomes.index(base)])
+        indice, values = indice[linhas], values[linhas]
+    if start is not None:
+        manter = indice > np.datetime64(pd.Timestamp(start))
+        indice, values = indice[manter], values[manter]
+
+    return pd.DataFrame(values, index=pd.DatetimeIndex(indice, name="Date"), columns=nomes)
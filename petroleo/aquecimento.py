@@ -0,0 +1,42 @@
+"""Aquecimento em segundo plano das bibliotecas pesadas.
+
+As páginas importam xgboost, scikit-learn, plotly e joblib só no primeiro uso.
+Depois que a página inicial (`App.py`) é desenhada, `warm_up` importa essas
+bibliotecas numa thread, para que a primeira previsão não pague o custo.
+`PETROLEO_AQUECIMENTO=0` desativa.
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ("plotly.graph_objects", "sklearn.metrics", "xgboost", "joblib")
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _importar(modulos):
+    for nome in modulos:
+        inicio = time.perf_counter()
+        try:
+            importlib.import_module(nome)
+        except ImportError as exc:
+            logger.warning("Aquecimento: %s indisponível (%s)", nome, exc)
+            continue
+        logger.info("Aquecimento: %s importado em %.2fs", nome, time.perf_counter() - inicio)
+
+
+def warm_up(modulos=HEAVY_MODULES):
+    """Importa `modulos` numa thread em segundo plano (uma vez por processo) e devolve a thread."""
+    global _thread
+    if os.environ.get("PETROLEO_AQUECIMENTO", "1") == "0":
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_importar, args=(tuple(modulos),), daemon=True, name="aquecimento")
+            _thread.start()
+        return _thread
@@ -0,0 +1,113 @@
+"""Armazenamento local (Parquet) das séries diárias de preços, por ticker.
+
+As páginas leem sempre do disco; a rede só é usada para buscar os pregões
+a partir da última data gravada (append incremental que também corrige o
+último pregão, se ele foi gravado antes do fechamento).
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import telemetria
+
+DATA_DIR = Path(os.environ.get("PETROLEO_DATA_DIR", Path(__file__).resolve().parent.parent / "dados"))
+COLUNAS = ["Date", "Close"]
+
+
+class YahooSource:
+    """Fonte padrão: histórico diário do Yahoo Finance via yfinance."""
+
+    def history(self, ticker, start=None):
+        import yfinance as yf
+
+        if start is None:
+            df = yf.Ticker(ticker).history(period="max", interval="1d")
+        else:
+            df = yf.Ticker(ticker).history(start=start, interval="1d")
+        df = df.reset_index()
+        df["Date"] = pd.to_datetime(df["Date"]).dt.tz_localize(None)
+        return df[COLUNAS]
+
+
+class FixtureSource:
+    """Fonte offline: lê `<diretorio>/<ticker>.csv` com colunas Date e Close."""
+
+    def __init__(self, diretorio):
+        self.diretorio = Path(diretorio)
+
+    def history(self, ticker, start=None):
+        df = pd.read_csv(self.diretorio / f"{ticker}.csv", parse_dates=["Date"])[COLUNAS]
+        if start is not None:
+            df = df[df["Date"] >= pd.Timestamp(start)]
+        return df
+
+
+class PriceStore:
+    """Séries de fechamento gravadas em `<diretorio>/<ticker>.parquet`."""
+
+    def __init__(self, diretorio=DATA_DIR, source=None):
+        self.diretorio = Path(diretorio)
+        self.source = source if source is not None else YahooSource()
+
+    def path(self, ticker):
+        return self.diretorio / f"{ticker}.parquet"
+
+    def read(self, ticker):
+        path = self.path(ticker)
+        if not path.exists():
+            return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Close": pd.Series(dtype="float64")})
+        return pd.read_parquet(path)
+
+    def write(self, ticker, df):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(ticker).with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path(ticker))
+
+    def last_date(self, ticker):
+        df = self.read(ticker)
+        return None if df.empty else df["Date"].iloc[-1]
+
+    def refresh(self, ticker):
+        """Busca os pregões a partir da última data gravada (inclusive) e faz o append.
+
+        O último pregão é buscado de novo: se foi gravado com o dia ainda em
+        andamento, o fechamento definitivo o substitui.
+        """
+        atual = self.read(ticker)
+        start = None
+        if not atual.empty:
+            start = atual["Date"].iloc[-1]
+            if start.normalize() > pd.Timestamp.today().normalize():
+                return atual
+        try:
+            with telemetria.timer("petroleo_source_seconds", ticker=ticker):
+                novos = self.source.history(ticker, start=start)
+        except Exception:
+            # Sem rede: mantém o que já está em disco
+            if atual.empty:
+                raise
+            return atual
+        novos = novos.dropna(subset=["Close"])
+        if novos.empty:
+            return atual
+        df = pd.concat([atual, novos], ignore_index=True) if not atual.empty else novos.reset_index(drop=True)
+        df = df.drop_duplicates("Date", keep="last").sort_values("Date").reset_index(drop=True)
+        if df.equals(atual):
+            # Só o último pregão voltou, sem mudança: não regrava (o mtime do arquivo marca a versão)
+            return atual
+        self.write(ticker, df)
+        return df
+
+    def load(self, ticker, refresh=False):
+        """Leitura local; só vai à fonte se não houver dados ou se `refresh=True`."""
+        if refresh or not self.path(ticker).exists():
+            return self.refresh(ticker)
+        return self.read(ticker)
+
+
+def default_store():
+    # PETROLEO_FIXTURES aponta para um diretório de CSVs que substitui o Yahoo (uso offline/testes)
+    fixtures = os.environ.get("PETROLEO_FIXTURES")
+    return PriceStore(source=FixtureSource(fixtures) if fixtures else None)
@@ -0,0 +1,77 @@
+"""Modelo pré-treinado versionado (xgb_model.joblib) para servir sem treino.
+
+O artefato é carregado uma vez por processo. Um arquivo de metadados ao lado
+dele (`<artefato>.json`) registra a versão, os hiperparâmetros e a última
+data usada no treino (que permite continuar o boosting apenas com os dias
+novos). Os metadados são lidos sem carregar o modelo (`load_metadata`).
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+ARTIFACT_PATH = Path(__file__).resolve().parent.parent / "xgb_model.joblib"
+
+
+@dataclass
+class Artifact:
+    booster: object
+    version: str
+    features: list
+    trained_until: Optional[pd.Timestamp] = None
+    params: dict = field(default_factory=dict)
+
+
+def _meta_path(path):
+    return Path(path).with_suffix(".json")
+
+
+def load_metadata(path=ARTIFACT_PATH):
+    """Metadados do artefato (dict vazio se não houver `.json`); não importa joblib nem xgboost."""
+    try:
+        return json.loads(_meta_path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def load_artifact(path=ARTIFACT_PATH):
+    import joblib
+
+    path = Path(path)
+    modelo = joblib.load(path)
+    booster = modelo.get_booster() if hasattr(modelo, "get_booster") else modelo
+    meta = load_metadata(path)
+    version = meta.get("version") or hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    trained_until = pd.Timestamp(meta["trained_until"]) if meta.get("trained_until") else None
+    return Artifact(booster, version, list(booster.feature_names or []), trained_until, meta.get("params", {}))
+
+
+def save_artifact(booster, trained_until, params=None, path=ARTIFACT_PATH):
+    """Grava o booster e seus metadados; a versão é o hash do conteúdo gravado."""
+    import joblib
+
+    path = Path(path)
+    joblib.dump(booster, path)
+    meta = {
+        "version": hashlib.sha256(path.read_bytes()).hexdigest()[:12],
+        "trained_until": str(pd.Timestamp(trained_until).date()),
+        "features": list(booster.feature_names or []),
+        "params": params or {},
+    }
+    _meta_path(path).write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    return meta["version"]
+
+
+def compatible(artifact, features):
+    return artifact.features == list(features)
+
+
+def warm_start(artifact, x_new, y_new, params, num_boost_round=50):
+    """Continua o boosting do artefato (`xgb_model=`) usando só os dias novos."""
+    import xgboost as xgb
+
+    dnew = xgb.DMatrix(x_new, label=y_new)
+    return xgb.train(params=params, dtrain=dnew, num_boost_round=num_boost_round, xgb_model=artifact.booster)
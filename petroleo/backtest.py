@@ -0,0 +1,105 @@
+"""Backtest walk-forward (janela expansível) com dobras executadas em paralelo.
+
+Cada dobra treina com todo o histórico até a data de corte e prevê
+recursivamente os `horizonte` pregões seguintes, que nunca entram no treino.
+Os processos (spawn, nunca fork do servidor) ocupam vagas do agendador de
+treino do processo, com o `nthread` de cada vaga; um backtest que passa de
+`timeout` segundos é encerrado. Os resultados são gravados em disco por
+(versão dos dados, parâmetros).
+"""
+import multiprocessing
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petroleo.armazenamento import DATA_DIR
+from petroleo.features import SELECTED_FEATURES, TARGET
+from petroleo.metricas import calculate_metrics
+from petroleo.modelos import fingerprint, model_key
+from petroleo.treino import default_scheduler, spawn_context
+
+CACHE_DIR = DATA_DIR / "backtests"
+
+
+@dataclass
+class BacktestResult:
+    folds: pd.DataFrame
+    horizons: pd.DataFrame
+
+
+def walk_forward_splits(n, n_folds, horizonte, min_train=252 * 2):
+    """Pontos de corte (fim do treino) espaçados igualmente até o fim da série."""
+    ultimo = n - horizonte
+    if ultimo <= min_train:
+        raise ValueError("Histórico curto demais para o backtest solicitado.")
+    cortes = np.linspace(min_train, ultimo, num=min(n_folds, ultimo - min_train + 1)).astype(int)
+    return sorted(set(cortes.tolist()))
+
+
+def _fit_fold(args):
+    import xgboost as xgb
+
+    from petroleo.previsao import recursive_forecast
+
+    corte, X, y, datas, horizonte, params, num_boost_round = args
+    # Mesmo treino de `petroleo.treino`: matriz quantizada (hist) com o `nthread` da fatia deste processo
+    dtrain = xgb.QuantileDMatrix(X[:corte], label=y[:corte], feature_names=SELECTED_FEATURES,
+                                 nthread=params["nthread"])
+    booster = xgb.train({**params, "tree_method": "hist"}, dtrain, num_boost_round=num_boost_round)
+    pred = recursive_forecast(booster, y[corte - 1], datas[corte:corte + horizonte], SELECTED_FEATURES)[:, 0]
+    return corte, pred
+
+
+def run_backtest(basef, params, n_folds=20, horizonte=7, num_boost_round=300, max_workers=None, timeout=600,
+                 scheduler=None):
+    X = basef[SELECTED_FEATURES].to_numpy(dtype=np.float32)
+    y = basef[TARGET].to_numpy(dtype=np.float32)
+    datas = basef.index
+    cortes = walk_forward_splits(len(y), n_folds, horizonte)
+
+    # Processos e núcleos vêm do agendador: backtests, buscas e treinos simultâneos dividem a mesma CPU
+    scheduler = scheduler or default_scheduler()
+    with scheduler.slots(min(max_workers or len(cortes), len(cortes))) as (processos, nthread):
+        tarefas = [(c, X, y, datas, horizonte, {**params, "nthread": nthread}, num_boost_round) for c in cortes]
+        # multiprocessing.Pool (e não ProcessPoolExecutor): ao sair, `terminate` encerra um backtest estourado
+        with spawn_context().Pool(processes=processos) as pool:
+            try:
+                resultados = pool.map_async(_fit_fold, tarefas).get(timeout=timeout)
+            except multiprocessing.TimeoutError:
+                raise TimeoutError(f"backtest excedeu {timeout:.0f}s") from None
+
+    folds, erros = [], []
+    for corte, pred in resultados:
+        real = y[corte:corte + horizonte]
+        mae, mse, rmse, mape = calculate_metrics(real, pred)
+        folds.append({"Início do teste": datas[corte], "Treino (dias)": corte,
+                      "MAE": mae, "RMSE": rmse, "MAPE": mape})
+        erros.append(pred - real)
+
+    erros = np.vstack(erros)
+    reais = np.vstack([y[c:c + horizonte] for c, _ in resultados])
+    horizons = pd.DataFrame({
+        "Horizonte": np.arange(1, horizonte + 1),
+        "MAE": np.abs(erros).mean(axis=0),
+        "RMSE": np.sqrt((erros ** 2).mean(axis=0)),
+        "MAPE": (np.abs(erros) / np.abs(reais)).mean(axis=0) * 100,
+    })
+    return BacktestResult(pd.DataFrame(folds), horizons)
+
+
+def cached_backtest(basef, params, n_folds=20, horizonte=7, num_boost_round=300, cache_dir=CACHE_DIR):
+    """`run_backtest` com cache em disco por (versão dos dados, parâmetros)."""
+    key = model_key(fingerprint(basef[[TARGET]]),
+                    {**params, "n_folds": n_folds, "horizonte": horizonte, "num_boost_round": num_boost_round})
+    cache_dir = Path(cache_dir)
+    folds_path, horizons_path = cache_dir / f"{key}-folds.parquet", cache_dir / f"{key}-horizons.parquet"
+    if folds_path.exists() and horizons_path.exists():
+        return BacktestResult(pd.read_parquet(folds_path), pd.read_parquet(horizons_path))
+
+    resultado = run_backtest(basef, params, n_folds, horizonte, num_boost_round)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    resultado.folds.to_parquet(folds_path, index=False)
+    resultado.horizons.to_parquet(horizons_path, index=False)
+    return resultado
@@ -0,0 +1,130 @@
+"""Coleta concorrente de várias fontes, com timeout, retentativas e tempos por fonte.
+
+Cada fonte é uma função sem argumentos; a rede fica atrás de um transporte
+plugável (`UrlTransport` ou `FixtureTransport`) para rodar offline.
+"""
+import io
+import os
+import time
+import urllib.parse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from petroleo import telemetria
+
+
+@dataclass
+class FetchResult:
+    name: str
+    value: Any = None
+    elapsed: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class UrlTransport:
+    """Transporte HTTP simples (urllib)."""
+
+    def __init__(self, timeout=15):
+        self.timeout = timeout
+
+    def get(self, url):
+        with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+            return resp.read()
+
+    def conditional_get(self, url, etag=None):
+        """(conteúdo, ETag); conteúdo None quando o servidor responde 304 (não modificado)."""
+        pedido = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+        try:
+            with urllib.request.urlopen(pedido, timeout=self.timeout) as resp:
+                return resp.read(), resp.headers.get("ETag")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return None, etag
+            raise
+
+
+class FixtureTransport:
+    """Responde cada URL com o arquivo local de mesmo nome em `diretorio`."""
+
+    def __init__(self, diretorio):
+        self.diretorio = Path(diretorio)
+
+    def path(self, url):
+        return self.diretorio / urllib.parse.unquote(Path(urllib.parse.urlparse(url).path).name)
+
+    def get(self, url):
+        return self.path(url).read_bytes()
+
+    def conditional_get(self, url, etag=None):
+        # ETag local: tamanho + data de modificação do arquivo
+        info = self.path(url).stat()
+        atual = f'"{info.st_size:x}-{info.st_mtime_ns:x}"'
+        return (None, etag) if atual == etag else (self.get(url), atual)
+
+
+def default_transport():
+    fixtures = os.environ.get("PETROLEO_FIXTURES")
+    return FixtureTransport(fixtures) if fixtures else UrlTransport()
+
+
+def read_csv_url(url, transport=None, **kwargs):
+    transport = transport if transport is not None else default_transport()
+    return pd.read_csv(io.BytesIO(transport.get(url)), **kwargs)
+
+
+def _run(name, fn, retries, backoff):
+    inicio = time.perf_counter()
+    erro = None
+    for tentativa in range(1, retries + 2):
+        try:
+            valor = fn()
+            telemetria.observe("petroleo_fetch_seconds", time.perf_counter() - inicio, fonte=name)
+            return FetchResult(name, valor, time.perf_counter() - inicio, tentativa)
+        except Exception as exc:
+            erro = f"{type(exc).__name__}: {exc}"
+            telemetria.incr("petroleo_fetch_errors_total", fonte=name)
+            if tentativa <= retries:
+                time.sleep(backoff * 2 ** (tentativa - 1))
+    return FetchResult(name, None, time.perf_counter() - inicio, retries + 1, erro)
+
+
+def fetch_all(tasks, timeout=30, retries=2, backoff=0.5, timeouts=None, max_workers=None):
+    """Executa `tasks` ({nome: função}) em paralelo e devolve {nome: FetchResult}.
+
+    Falhas e timeouts não interrompem as demais fontes: o resultado vem com
+    `error` preenchido e `value=None`. `timeouts` permite limites por fonte.
+    """
+    timeouts = timeouts or {}
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(tasks) or 1, thread_name_prefix="coleta")
+    inicio = time.perf_counter()
+    futuros = {name: pool.submit(_run, name, fn, retries, backoff) for name, fn in tasks.items()}
+    resultados = {}
+    for name, futuro in futuros.items():
+        limite = inicio + timeouts.get(name, timeout)
+        try:
+            resultados[name] = futuro.result(timeout=max(0.0, limite - time.perf_counter()))
+        except FutureTimeout:
+            resultados[name] = FetchResult(name, None, time.perf_counter() - inicio, 0,
+                                           f"timeout após {timeouts.get(name, timeout)}s")
+    # Threads lentas seguem em segundo plano sem bloquear a página
+    pool.shutdown(wait=False, cancel_futures=True)
+    return resultados
+
+
+def timings(resultados):
+    return pd.DataFrame([
+        {"Fonte": r.name, "Tempo (s)": round(r.elapsed, 3), "Tentativas": r.attempts, "Erro": r.error or ""}
+        for r in resultados.values()
+    ])
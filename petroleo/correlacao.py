@@ -0,0 +1,195 @@
+"""Correlação móvel e defasagem (lead-lag) entre todas as séries da matriz alinhada.
+
+As correlações são calculadas sobre os retornos logarítmicos diários (níveis
+de preço têm correlação espúria). Uma passada monta as somas de prefixo de
+cada série, dos quadrados e dos produtos de todos os pares (triângulo
+superior); a matriz de correlação de qualquer janela sai em O(pares), e a
+série móvel inteira de uma janela é uma diferença de prefixos vetorizada.
+Como a matriz vem com forward-fill, cada série só tem NaN no início: cada
+par usa os dias em que as duas séries existem.
+
+A defasagem usa a correlação cruzada via FFT dos retornos padronizados da
+janela, para todos os pares de uma vez, até 1/4 da janela de defasagem. Dias novos estendem os prefixos
+sem recalcular o histórico; os resultados ficam em cache por janela.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Janelas de cálculo oferecidas na página (pregões: rótulo)
+JANELAS = {21: "1 mês", 63: "3 meses", 126: "6 meses", 252: "1 ano", 504: "2 anos", 756: "3 anos"}
+MAX_LAG = 20
+
+
+def lag_limit(janela, max_lag=MAX_LAG):
+    """Maior defasagem testada numa janela: no máximo 1/4 dela, para a sobreposição nunca cair abaixo de 3/4."""
+    return max(1, min(max_lag, janela // 4))
+
+
+def log_returns(matriz):
+    """Retornos logarítmicos diários (a primeira linha e os dias antes de cada série começar são NaN)."""
+    valores = np.asarray(matriz, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retornos = np.diff(np.log(valores), axis=0, prepend=np.nan)
+    retornos[~np.isfinite(retornos)] = np.nan
+    return retornos
+
+
+class CorrelationEngine:
+    def __init__(self, basef=None, colunas=None, max_cache=32):
+        self.colunas = list(colunas) if colunas is not None else None
+        self.max_cache = max_cache
+        self._lock = threading.RLock()
+        self._reset()
+        if basef is not None:
+            self.update(basef)
+
+    def _reset(self):
+        self.datas = np.array([], dtype="datetime64[ns]")
+        self.niveis = None
+        self._i, self._j = np.triu_indices(len(self.colunas or []))
+        self._inicio = np.zeros(len(self.colunas or []), dtype=np.int64)
+        self._sx = self._sxx = self._sxy = None
+        self._cache = OrderedDict()
+
+    @property
+    def versao(self):
+        return len(self.datas), str(self.datas[-1]) if len(self.datas) else None
+
+    # ---- construção ----
+    def update(self, basef):
+        """Incorpora `basef` (Date + colunas); só os dias novos entram nas somas de prefixo."""
+        with self._lock:
+            if self.colunas is None:
+                self.colunas = [c for c in basef.columns if c != "Date"]
+                self._reset()
+            datas = basef["Date"].to_numpy(dtype="datetime64[ns]")
+            niveis = basef[self.colunas].to_numpy(dtype="float64")
+            n = len(self.datas)
+            if n and (len(datas) < n or not np.array_equal(datas[:n], self.datas)
+                      or not np.array_equal(niveis[:n], self.niveis, equal_nan=True)):
+                self._reset()
+                n = 0
+            if len(datas) == n:
+                return 0
+            # O retorno do primeiro dia novo depende do último nível já conhecido
+            retornos = log_returns(niveis[max(0, n - 1):])[1 if n else 0:]
+            validos = ~np.isnan(retornos)
+            x = np.where(validos, retornos, 0.0)
+            if n == 0:
+                # Forward-fill: cada série é válida do seu primeiro retorno em diante
+                self._inicio = np.where(validos.any(axis=0), validos.argmax(axis=0), len(datas))
+                zeros = np.zeros((1, x.shape[1]))
+                self._sx, self._sxx = zeros, zeros
+                self._sxy = np.zeros((1, len(self._i)))
+            self._sx = np.concatenate([self._sx, self._sx[-1] + np.cumsum(x, axis=0)])
+            self._sxx = np.concatenate([self._sxx, self._sxx[-1] + np.cumsum(x * x, axis=0)])
+            self._sxy = np.concatenate([self._sxy, self._sxy[-1] + np.cumsum(x[:, self._i] * x[:, self._j], axis=0)])
+            self.datas, self.niveis = datas, niveis
+            self._cache.clear()
+            return len(datas) - n
+
+    def _cached(self, chave, calcular):
+        with self._lock:
+            if chave in self._cache:
+                self._cache.move_to_end(chave)
+                return self._cache[chave]
+        resultado = calcular()
+        with self._lock:
+            self._cache[chave] = resultado
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return resultado
+
+    # ---- correlação móvel ----
+    def _pares(self, inicio, fim):
+        """Correlação de todos os pares nas janelas [inicio, fim) (arrays de índices de prefixo)."""
+        a = np.maximum(inicio[:, None], np.maximum(self._inicio[self._i], self._inicio[self._j])[None, :])
+        a = np.minimum(a, fim[:, None])
+        b = np.broadcast_to(fim[:, None], a.shape)
+        n = (b - a).astype("float64")
+        cols = np.arange(len(self._i))[None, :]
+        si = self._sx[b, self._i] - self._sx[a, self._i]
+        sj = self._sx[b, self._j] - self._sx[a, self._j]
+        sii = self._sxx[b, self._i] - self._sxx[a, self._i]
+        sjj = self._sxx[b, self._j] - self._sxx[a, self._j]
+        sij = self._sxy[b, cols] - self._sxy[a, cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sij - si * sj / n
+            var = (sii - si * si / n) * (sjj - sj * sj / n)
+            corr = cov / np.sqrt(var)
+        corr[(n < 3) | ~np.isfinite(corr)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def matrix(self, janela, fim=None):
+        """Matriz de correlação (DataFrame) dos últimos `janela` dias até `fim` (índice de linha, exclusivo)."""
+        def calcular():
+            b = len(self.datas) if fim is None else int(fim)
+            corr = self._pares(np.array([max(0, b - janela)]), np.array([b]))[0]
+            m = np.full((len(self.colunas),) * 2, np.nan)
+            m[self._i, self._j] = corr
+            m[self._j, self._i] = corr
+            return pd.DataFrame(m, index=self.colunas, columns=self.colunas)
+
+        return self._cached(("matriz", self.versao, janela, fim), calcular)
+
+    def rolling(self, janela, base=None):
+        """Correlação móvel de cada par (ou só dos pares com `base`) ao longo do tempo."""
+        def calcular():
+            fins = np.arange(janela, len(self.datas) + 1)
+            corr = self._pares(fins - janela, fins)
+            nomes = [f"{self.colunas[i]}×{self.colunas[j]}" for i, j in zip(self._i, self._j)]
+            tabela = pd.DataFrame(corr, index=pd.DatetimeIndex(self.datas[fins - 1], name="Date"), columns=nomes)
+            tabela = tabela[[n for n, i, j in zip(nomes, self._i, self._j) if i != j]]
+            if base is not None:
+                tabela = tabela[[n for n in tabela.columns if base in n.split("×")]]
+                tabela.columns = [next(p for p in n.split("×") if p != base) for n in tabela.columns]
+            return tabela
+
+        return self._cached(("movel", self.versao, janela, base), calcular)
+
+    # ---- defasagem (lead-lag) ----
+    def lead_lag(self, janela, max_lag=MAX_LAG):
+        """(correlação máxima, defasagem em dias) de cada par na janela, via FFT de todos os pares de uma vez.
+
+        Defasagem positiva em [linha, coluna]: a série da coluna antecede a da linha em tantos dias.
+        A defasagem vai até `lag_limit(janela, max_lag)`: cada defasagem usa ao menos 3/4 da janela,
+        e a correlação é normalizada pela energia das duas séries no trecho sobreposto.
+        """
+        max_lag = lag_limit(janela, max_lag)
+
+        def calcular():
+            retornos = log_returns(self.niveis[-(janela + 1):])[1:]
+            validos = ~np.isnan(retornos)
+            contagem = np.maximum(validos.sum(axis=0), 1)
+            media = np.nansum(retornos, axis=0) / contagem
+            desvio = np.sqrt(np.nansum((retornos - media) ** 2, axis=0) / contagem)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = np.where(validos, (retornos - media) / desvio, 0.0)
+            z[:, desvio == 0] = 0.0
+            n = len(z)
+            nfft = 1 << int(np.ceil(np.log2(2 * n)))
+            espectro = np.fft.rfft(z, n=nfft, axis=0)
+            # Correlação cruzada de todos os pares: (defasagem, k, k)
+            cruzada = np.fft.irfft(espectro[:, :, None] * np.conj(espectro[:, None, :]), n=nfft, axis=0)
+            lags = np.arange(-max_lag, max_lag + 1)
+            cruzada = cruzada[lags % nfft]
+            # Energia de cada série no trecho sobreposto: linha em [max(L, 0), n + min(L, 0)),
+            # coluna em [max(-L, 0), n - max(L, 0))
+            energia = np.concatenate([np.zeros((1, z.shape[1])), np.cumsum(z * z, axis=0)])
+            linha = energia[n + np.minimum(lags, 0)] - energia[np.maximum(lags, 0)]
+            coluna = energia[n - np.maximum(lags, 0)] - energia[np.maximum(-lags, 0)]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cruzada = cruzada / np.sqrt(linha[:, :, None] * coluna[:, None, :])
+            cruzada[~np.isfinite(cruzada)] = 0.0
+            melhor = np.abs(cruzada).argmax(axis=0)
+            pico = np.take_along_axis(cruzada, melhor[None], axis=0)[0]
+            defasagem = lags[melhor]
+            pico[:, contagem < 3] = np.nan
+            pico[contagem < 3, :] = np.nan
+            return (pd.DataFrame(np.clip(pico, -1, 1), index=self.colunas, columns=self.colunas),
+                    pd.DataFrame(defasagem, index=self.colunas, columns=self.colunas))
+
+        return self._cached(("defasagem", self.versao, janela, max_lag), calcular)
@@ -0,0 +1,56 @@
+"""Motor declarativo de features sobre a matriz alinhada de várias séries.
+
+A partir da matriz de `alinhamento.align` (uma coluna por ativo), gera
+defasagens, estatísticas em janelas móveis, retornos e features entre ativos
+(spread de retornos e correlação móvel com a série alvo). Cada bloco é
+calculado para todas as colunas de uma vez com operações vetorizadas do
+pandas/NumPy. Todo o resultado é deslocado um pregão: a linha t só usa
+informação disponível até t-1.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    target: str
+    lags: tuple = (1, 2, 3, 5, 10, 21)
+    windows: tuple = (5, 10, 21, 63, 126, 252)
+    stats: tuple = ("mean", "std", "min", "max")
+    returns: tuple = (1, 5, 21)
+    cross: bool = True
+
+
+def _bloco(df, sufixo):
+    return df.add_suffix(sufixo)
+
+
+def build_features(matriz, spec):
+    """Devolve um DataFrame float32 com todas as features de `spec`, indexado como `matriz`."""
+    matriz = matriz.astype(np.float64)
+    blocos = []
+
+    # Defasagens: após o deslocamento final, shift(k - 1) vira a defasagem k
+    blocos += [_bloco(matriz.shift(k - 1), f"_lag{k}") for k in spec.lags]
+
+    # Estatísticas em janelas móveis (todas as colunas e estatísticas por janela de uma vez)
+    for janela in spec.windows:
+        agregado = matriz.rolling(janela, min_periods=1).agg(list(spec.stats))
+        agregado.columns = [f"{col}_{stat}{janela}" for col, stat in agregado.columns]
+        blocos.append(agregado)
+
+    log = np.log(matriz.where(matriz > 0))
+    blocos += [_bloco(log.diff(k), f"_ret{k}") for k in spec.returns]
+
+    if spec.cross:
+        ret = log.diff()
+        outras = ret.drop(columns=spec.target)
+        blocos.append(_bloco(outras.sub(ret[spec.target], axis=0), f"_spread_{spec.target}"))
+        for janela in spec.windows:
+            corr = outras.rolling(janela, min_periods=2).corr(ret[spec.target])
+            blocos.append(_bloco(corr, f"_corr{janela}_{spec.target}"))
+
+    features = pd.concat(blocos, axis=1).shift(1)
+    return pd.DataFrame(features.to_numpy(dtype=np.float32), index=matriz.index, columns=features.columns)
@@ -0,0 +1,39 @@
+"""Esquema interno compacto dos quadros em cache e rótulos de exibição.
+
+Internamente as colunas usam chaves curtas e tipos enxutos (float32 para
+preços, int8/int16 para calendário). Os rótulos em português aparecem apenas
+na exibição (`display`). Os quadros compartilhados entre sessões ficam em
+`st.cache_resource`: cada acesso devolve o mesmo objeto, sem cópia. Por isso
+eles devem ser tratados como somente leitura: derive novos quadros em vez de
+alterá-los no lugar.
+"""
+import numpy as np
+import pandas as pd
+
+LABELS = {
+    "brent": "Preço - petróleo bruto (Brent) - em dólares",
+    "sp500": "S&P500",
+    "gold": "Gold",
+    "dxy": "Índice DXY",
+    "tasi": "TASI",
+    "retorno": "Retorno Diário Petróleo",
+}
+
+# Colunas de calendário: inteiros pequenos; demais colunas numéricas: float32
+INT_DTYPES = {"Ano": np.int16, "Mês": np.int8, "Dia": np.int8, "Dia_Semana": np.int8}
+
+
+def compact(df):
+    """Converte as colunas numéricas para os tipos compactos do esquema (sem alterar `df`)."""
+    tipos = {}
+    for col, dtype in df.dtypes.items():
+        if col in INT_DTYPES:
+            tipos[col] = INT_DTYPES[col]
+        elif pd.api.types.is_float_dtype(dtype):
+            tipos[col] = np.float32
+    return df.astype(tipos)
+
+
+def display(df):
+    """Renomeia as chaves internas para os rótulos de exibição."""
+    return df.rename(columns=LABELS)
@@ -0,0 +1,211 @@
+"""Estatísticas por ano e por janela de evento (média, mínimo, máximo, variação) da série do Brent.
+
+Uma passada sobre a série monta as somas de prefixo (média de qualquer
+janela em O(1)) e tabelas esparsas de argmin/argmax (mínimo e máximo de
+qualquer janela em O(1), com O(n log n) de construção). Os limites da janela
+são achados por busca binária nas datas. Pregões novos são acrescentados de
+forma incremental: só as entradas que terminam nos dias novos são calculadas.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Event:
+    nome: str
+    inicio: str
+    fim: str
+
+
+EVENTOS = (
+    Event("Subprime 2008", "2008-01-01", "2008-12-31"),
+    Event("Primavera Árabe", "2011-01-01", "2012-12-31"),
+    Event("Crise de 2014", "2014-06-01", "2015-12-31"),
+    Event("COVID-19", "2020-01-01", "2021-12-31"),
+    Event("Rússia 2022", "2022-02-24", "2022-12-31"),
+)
+
+
+@dataclass
+class WindowStats:
+    inicio: pd.Timestamp
+    fim: pd.Timestamp
+    dias: int
+    media: float
+    minimo: float
+    data_minimo: pd.Timestamp
+    maximo: float
+    data_maximo: pd.Timestamp
+    # Média da janela menos a média da janela anterior de mesmo número de pregões
+    variacao: float
+    variacao_pct: float
+
+
+class EventAnalytics:
+    def __init__(self, precos=None):
+        self._lock = threading.RLock()
+        self._reset()
+        if precos is not None:
+            self.update(precos)
+
+    def _reset(self):
+        self.datas = np.array([], dtype="datetime64[ns]")
+        self.valores = np.array([], dtype="float64")
+        self._soma = np.zeros(1)
+        self._argmin = [np.array([], dtype=np.int64)]
+        self._argmax = [np.array([], dtype=np.int64)]
+
+    def __len__(self):
+        return len(self.valores)
+
+    # ---- construção ----
+    def update(self, precos):
+        """Incorpora `precos` (Series indexada por data ou DataFrame Date/Close); devolve quantos pregões entraram."""
+        if isinstance(precos, pd.DataFrame):
+            precos = precos.set_index("Date")["Close"]
+        precos = precos.dropna().sort_index()
+        datas = precos.index.to_numpy(dtype="datetime64[ns]")
+        valores = precos.to_numpy(dtype="float64")
+        with self._lock:
+            n = len(self.valores)
+            # Histórico reescrito (correção de dados): recomeça do zero
+            if n and (len(datas) < n or not (np.array_equal(datas[:n], self.datas)
+                                               and np.array_equal(valores[:n], self.valores))):
+                self._reset()
+                n = 0
+            novos = valores[n:]
+            if not len(novos):
+                return 0
+            self.datas = datas
+            self.valores = valores
+            self._soma = np.concatenate([self._soma, self._soma[-1] + np.cumsum(novos)])
+            self._estender(n)
+            return len(novos)
+
+    def _estender(self, n):
+        """Completa as tabelas esparsas com as entradas que incluem os índices >= n."""
+        total = len(self.valores)
+        self._argmin[0] = np.arange(total)
+        self._argmax[0] = np.arange(total)
+        nivel = 1
+        while (1 << nivel) <= total:
+            meio = 1 << (nivel - 1)
+            tamanho = total - (1 << nivel) + 1
+            for tabela, escolher in ((self._argmin, np.less_equal), (self._argmax, np.greater_equal)):
+                anterior = tabela[nivel - 1]
+                atual = tabela[nivel] if nivel < len(tabela) else np.array([], dtype=np.int64)
+                # Entradas já calculadas não mudam; só as novas posições (que alcançam os dias novos)
+                inicio = len(atual)
+                esquerda, direita = anterior[inicio:tamanho], anterior[inicio + meio:tamanho + meio]
+                novas = np.where(escolher(self.valores[esquerda], self.valores[direita]), esquerda, direita)
+                atual = np.concatenate([atual, novas])
+                if nivel < len(tabela):
+                    tabela[nivel] = atual
+                else:
+                    tabela.append(atual)
+            nivel += 1
+
+    # ---- consultas ----
+    def _indices(self, inicio, fim):
+        i = int(np.searchsorted(self.datas, np.datetime64(pd.Timestamp(inicio)), side="left"))
+        j = int(np.searchsorted(self.datas, np.datetime64(pd.Timestamp(fim)), side="right"))
+        return i, j
+
+    def _mean(self, i, j):
+        return (self._soma[j] - self._soma[i]) / (j - i) if j > i else np.nan
+
+    def _arg(self, tabela, escolher, i, j):
+        nivel = (j - i).bit_length() - 1
+        a, b = tabela[nivel][i], tabela[nivel][j - (1 << nivel)]
+        return a if escolher(self.valores[a], self.valores[b]) else b
+
+    def window(self, inicio, fim):
+        """Estatísticas dos pregões entre `inicio` e `fim` (inclusive); None se não houver pregões."""
+        with self._lock:
+            i, j = self._indices(inicio, fim)
+            if j <= i:
+                return None
+            a = self._arg(self._argmin, np.less_equal, i, j)
+            b = self._arg(self._argmax, np.greater_equal, i, j)
+            media = self._mean(i, j)
+            anterior = self._mean(max(0, i - (j - i)), i)
+            return WindowStats(
+                pd.Timestamp(self.datas[i]), pd.Timestamp(self.datas[j - 1]), j - i, float(media),
+                float(self.valores[a]), pd.Timestamp(self.datas[a]), float(self.valores[b]),
+                pd.Timestamp(self.datas[b]), float(media - anterior), float((media / anterior - 1) * 100),
+            )
+
+    def previous_window(self, inicio, fim):
+        """Estatísticas da janela de mesmo número de pregões logo antes de [inicio, fim] (a base de `variacao`)."""
+        with self._lock:
+            i, j = self._indices(inicio, fim)
+            a = max(0, i - (j - i))
+            if j <= i or i <= a:
+                return None
+            return self.window(self.datas[a], self.datas[i - 1])
+
+    def overall(self):
+        return self.window(self.datas[0], self.datas[-1]) if len(self) else None
+
+    def yearly(self):
+        """Uma linha por ano, com a variação da média em relação ao ano anterior."""
+        if not len(self):
+            return pd.DataFrame()
+        anos = range(pd.Timestamp(self.datas[0]).year, pd.Timestamp(self.datas[-1]).year + 1)
+        linhas = {ano: self.window(f"{ano}-01-01", f"{ano}-12-31") for ano in anos}
+        tabela = pd.DataFrame([
+            {"Ano": ano, "Pregões": s.dias, "Média": s.media, "Mínimo": s.minimo, "Máximo": s.maximo}
+            for ano, s in linhas.items() if s is not None
+        ])
+        tabela["Variação"] = tabela["Média"].diff()
+        tabela["Variação (%)"] = tabela["Média"].pct_change() * 100
+        return tabela
+
+    def events(self, eventos=EVENTOS):
+        """Uma linha por evento, com a variação da média em relação à janela anterior de mesmo tamanho."""
+        linhas = []
+        for evento in eventos:
+            s = self.window(evento.inicio, evento.fim)
+            if s is None:
+                continue
+            linhas.append({"Evento": evento.nome, "Início": s.inicio, "Fim": s.fim, "Pregões": s.dias,
+                           "Média": s.media, "Mínimo": s.minimo, "Máximo": s.maximo, "Variação": s.variacao,
+                           "Variação (%)": s.variacao_pct})
+        return pd.DataFrame(linhas)
+
+    def event_of(self, data, eventos=EVENTOS):
+        """Nome do evento cuja janela contém `data` (ou None)."""
+        data = pd.Timestamp(data)
+        return next((e.nome for e in eventos if pd.Timestamp(e.inicio) <= data <= pd.Timestamp(e.fim)), None)
+
+
+class StoreAnalytics(EventAnalytics):
+    """`EventAnalytics` ligado a um ticker do armazenamento; `refresh` só relê o arquivo quando ele muda."""
+
+    def __init__(self, store, ticker="BZ=F"):
+        super().__init__()
+        self.store = store
+        self.ticker = ticker
+        self._versao = None
+
+    def refresh(self):
+        path = self.store.path(self.ticker)
+        versao = path.stat().st_mtime_ns if path.exists() else None
+        with self._lock:
+            if versao is None or versao != self._versao:
+                self.update(self.store.load(self.ticker))
+                self._versao = self.store.path(self.ticker).stat().st_mtime_ns
+        return self
+
+
+def format_br(valor, casas=2, sinal=False):
+    """Número com separadores brasileiros: 1.234,56 (com `sinal`, +1.234,56)."""
+    texto = f"{valor:{'+' if sinal else ''},.{casas}f}"
+    return texto.replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def format_usd(valor, sinal=False):
+    return f"{format_br(valor, sinal=sinal)} USD/barril"
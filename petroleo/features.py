@@ -0,0 +1,107 @@
+"""Features de calendário, defasagem e janelas móveis usadas pelo modelo XGBoost.
+
+As features são calculadas uma vez por versão dos dados e gravadas ao lado dos
+preços brutos (`FeatureStore`). Quando chegam pregões novos, apenas a cauda é
+recalculada, usando o `lookback` de cada feature como histórico de apoio.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from petroleo.armazenamento import DATA_DIR
+from petroleo.esquema import compact
+
+TARGET = "brent"
+SELECTED_FEATURES = ['Ano', 'Mês', 'Dia', 'Dia_Semana', 'dia_anterior']
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    fn: Callable[[pd.Series], object]  # série de preços indexada por data -> valores
+    lookback: int = 0  # pregões anteriores necessários para calcular uma linha
+
+
+def rolling_mean(janela):
+    return Feature(f"media_{janela}d", lambda p: p.rolling(janela, min_periods=1).mean(), janela)
+
+
+def rolling_std(janela):
+    return Feature(f"desvio_{janela}d", lambda p: p.rolling(janela, min_periods=2).std(), janela)
+
+
+def volatility(janela):
+    # Volatilidade anualizada dos log-retornos
+    return Feature(f"volatilidade_{janela}d",
+                   lambda p: np.log(p).diff().rolling(janela, min_periods=2).std() * np.sqrt(252), janela + 1)
+
+
+DEFAULT_FEATURES = (
+    Feature('Ano', lambda p: p.index.year),
+    Feature('Mês', lambda p: p.index.month),
+    Feature('Dia', lambda p: p.index.day),
+    Feature('Dia_Semana', lambda p: p.index.weekday),
+    Feature('dia_anterior', lambda p: p.shift(1).bfill(), 1),
+)
+
+
+def compute_features(precos, features=DEFAULT_FEATURES):
+    precos = precos.rename(TARGET)
+    colunas = {TARGET: precos}
+    colunas.update({f.name: f.fn(precos) for f in features})
+    return compact(pd.DataFrame(colunas, index=precos.index))
+
+
+def create_time_features(df):
+    # Devolve um novo quadro: o quadro em cache de load_data() não é mais alterado
+    return df.join(compute_features(df[TARGET]).drop(columns=TARGET))
+
+
+class FeatureStore:
+    """Features persistidas em `<diretorio>/<ticker>-<assinatura>.parquet`."""
+
+    def __init__(self, diretorio=DATA_DIR / "features", features=DEFAULT_FEATURES):
+        self.diretorio = Path(diretorio)
+        self.features = tuple(features)
+        self.lookback = max((f.lookback for f in self.features), default=0)
+
+    def signature(self):
+        nomes = "|".join([TARGET] + [f"{f.name}:{f.lookback}" for f in self.features])
+        return hashlib.sha256(nomes.encode()).hexdigest()[:10]
+
+    def path(self, ticker):
+        return self.diretorio / f"{ticker}-{self.signature()}.parquet"
+
+    def _prefix_of(self, antigo, precos):
+        # Compara o histórico inteiro (vetorizado, barato perto de recalcular as features): uma correção
+        # em qualquer pregão antigo invalida as features gravadas e força o recálculo completo
+        n = len(antigo)
+        return (n <= len(precos)
+                and precos.index[:n].equals(antigo.index)
+                and np.allclose(precos.iloc[:n].to_numpy(dtype="float32"), antigo[TARGET].to_numpy()))
+
+    def update(self, ticker, precos):
+        """Features de `precos`, recalculando só os pregões após o último gravado."""
+        path = self.path(ticker)
+        antigo = pd.read_parquet(path) if path.exists() else None
+
+        if antigo is not None and len(antigo) > self.lookback and self._prefix_of(antigo, precos):
+            n = len(antigo)
+            if n == len(precos):
+                return antigo
+            inicio = n - self.lookback
+            cauda = compute_features(precos.iloc[inicio:], self.features).iloc[n - inicio:]
+            df = pd.concat([antigo, cauda])
+        else:
+            df = compute_features(precos, self.features)
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+        return df
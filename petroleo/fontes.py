@@ -0,0 +1,187 @@
+"""Adaptadores de fontes CSV com esquema explícito (números e datas em formato brasileiro).
+
+Cada `CsvSource` declara URL, colunas e formatos (`CsvSchema`). O arquivo é
+lido com o leitor CSV do pyarrow e convertido de forma vetorizada (sem
+`pd.to_datetime` inferindo o formato a cada carga). O resultado fica em
+Parquet, com o hash do conteúdo no nome, em `dados/fontes/`. Uma nova
+ingestão do mesmo arquivo não faz nada: o ETag (GET condicional) ou o hash
+do conteúdo mostram que nada mudou. Com `mirror`, o arquivo baixado também
+é gravado localmente e usado quando a rede falha.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import telemetria
+from petroleo.armazenamento import DATA_DIR
+from petroleo.coleta import default_transport
+
+SOURCES_DIR = DATA_DIR / "fontes"
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    date_column: str
+    value_column: str
+    # Formatos tentados em ordem; vale o primeiro que converte a coluna inteira (nunca linha a linha)
+    date_formats: tuple = ("%d.%m.%Y", "%d/%m/%Y", "%m/%d/%Y")
+    decimal: str = ","
+    thousands: str = "."
+
+
+BRAZILIAN_CSV = CsvSchema("Data", "Último")
+
+
+def _parse_pyarrow(corpo, schema):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    tabela = pacsv.read_csv(io.BytesIO(corpo), convert_options=pacsv.ConvertOptions(
+        include_columns=[schema.date_column, schema.value_column],
+        column_types={schema.date_column: pa.string(), schema.value_column: pa.string()},
+    ))
+    valores = pc.replace_substring(tabela[schema.value_column], schema.thousands, "")
+    valores = pc.utf8_trim_whitespace(pc.replace_substring(valores, schema.decimal, "."))
+    # Células não numéricas ("-", vazias) viram nulas, como no pandas, e caem no dropna de `parse_csv`
+    numericos = pc.match_substring_regex(valores, r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+    valores = pc.cast(pc.if_else(numericos, valores, pa.scalar(None, pa.string())), pa.float64())
+    datas_texto = tabela[schema.date_column]
+    for formato in schema.date_formats:
+        try:
+            datas = pc.strptime(datas_texto, format=formato, unit="s")
+            break
+        except pa.ArrowInvalid:
+            continue
+    else:
+        raise ValueError(f"datas de '{schema.date_column}' fora dos formatos {schema.date_formats}")
+    return pd.DataFrame({
+        "Date": pc.cast(datas, pa.timestamp("ns")).to_pandas(),
+        "Close": valores.to_pandas(),
+    })
+
+
+def _parse_pandas(corpo, schema):
+    df = pd.read_csv(io.BytesIO(corpo), usecols=[schema.date_column, schema.value_column],
+                     dtype={schema.date_column: str, schema.value_column: str}, keep_default_na=False)
+    for formato in schema.date_formats:
+        try:
+            datas = pd.to_datetime(df[schema.date_column], format=formato)
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"datas de '{schema.date_column}' fora dos formatos {schema.date_formats}")
+    valores = df[schema.value_column].str.replace(schema.thousands, "", regex=False)
+    valores = valores.str.replace(schema.decimal, ".", regex=False).str.strip()
+    # Mesma regra do caminho pyarrow: células não numéricas viram NaN e caem no dropna
+    return pd.DataFrame({"Date": datas, "Close": pd.to_numeric(valores, errors="coerce").astype("float64")})
+
+
+def parse_csv(corpo, schema):
+    """DataFrame Date/Close ordenado por data (pyarrow, ou pandas com formatos explícitos sem pyarrow)."""
+    try:
+        df = _parse_pyarrow(corpo, schema)
+    except ImportError:
+        df = _parse_pandas(corpo, schema)
+    return df.dropna().sort_values("Date", ignore_index=True)
+
+
+class CsvSource:
+    def __init__(self, nome, url, schema=BRAZILIAN_CSV, mirror=None, diretorio=SOURCES_DIR):
+        self.nome = nome
+        self.url = url
+        self.schema = schema
+        self.mirror = Path(mirror) if mirror else None
+        self.diretorio = Path(diretorio)
+        self._lock = threading.Lock()
+        self._memoria = None
+
+    @property
+    def meta_path(self):
+        return self.diretorio / f"{self.nome}.json"
+
+    def _meta(self):
+        try:
+            return json.loads(self.meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _cached(self, meta):
+        """Quadro em cache para `meta` (memória, senão Parquet), ou None."""
+        if not meta.get("hash"):
+            return None
+        if self._memoria is not None and self._memoria[0] == meta["hash"]:
+            return self._memoria[1]
+        path = self.diretorio / meta["arquivo"]
+        if not path.exists():
+            return None
+        df = pd.read_parquet(path)
+        self._memoria = (meta["hash"], df)
+        return df
+
+    def _download(self, transport, etag):
+        if self.url is None:
+            return self.mirror.read_bytes(), None
+        try:
+            return transport.conditional_get(self.url, etag)
+        except Exception:
+            # Sem rede: usa o espelho local, se houver
+            if self.mirror is not None and self.mirror.exists():
+                return self.mirror.read_bytes(), None
+            raise
+
+    def load(self, transport=None):
+        transport = transport if transport is not None else default_transport()
+        with self._lock:
+            meta = self._meta()
+            try:
+                corpo, etag = self._download(transport, meta.get("etag"))
+            except Exception:
+                em_cache = self._cached(meta)
+                if em_cache is None:
+                    raise
+                return em_cache
+            if corpo is None:
+                # 304: nada mudou desde a última ingestão
+                em_cache = self._cached(meta)
+                if em_cache is not None:
+                    telemetria.incr("petroleo_source_unchanged_total", fonte=self.nome, motivo="etag")
+                    return em_cache
+                corpo, etag = transport.conditional_get(self.url, None)
+            digest = hashlib.sha256(corpo).hexdigest()
+            if digest == meta.get("hash"):
+                em_cache = self._cached(meta)
+                if em_cache is not None:
+                    telemetria.incr("petroleo_source_unchanged_total", fonte=self.nome, motivo="hash")
+                    if etag and etag != meta.get("etag"):
+                        self._write_meta({**meta, "etag": etag})
+                    return em_cache
+
+            with telemetria.timer("petroleo_source_parse_seconds", fonte=self.nome):
+                df = parse_csv(corpo, self.schema)
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            arquivo = f"{self.nome}-{digest[:16]}.parquet"
+            tmp = self.diretorio / f".{arquivo}.tmp"
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, self.diretorio / arquivo)
+            anterior = meta.get("arquivo")
+            self._write_meta({"hash": digest, "etag": etag, "arquivo": arquivo, "linhas": len(df)})
+            if anterior and anterior != arquivo:
+                (self.diretorio / anterior).unlink(missing_ok=True)
+            if self.mirror is not None and self.url is not None:
+                self.mirror.parent.mkdir(parents=True, exist_ok=True)
+                self.mirror.write_bytes(corpo)
+            self._memoria = (digest, df)
+            return df
+
+    def _write_meta(self, meta):
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.meta_path)
@@ -0,0 +1,127 @@
+"""Decimação de séries longas para gráficos interativos (Plotly Scattergl).
+
+Uma série de 20 anos tem milhares de pontos; o gráfico tem algumas centenas de
+pixels de largura. `lttb` (Largest-Triangle-Three-Buckets) e `minmax` reduzem
+cada série ao número de pontos que cabe na largura, preservando a forma
+visual (picos e vales).
+"""
+import numpy as np
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) \
+        else x.astype(np.float64)
+
+
+def lttb(x, y, n_out):
+    """Índices dos `n_out` pontos escolhidos pelo LTTB (primeiro e último sempre incluídos)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+    bordas = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Médias de cada balde calculadas de uma vez com somas acumuladas
+    cx, cy = np.concatenate(([0.0], np.cumsum(x))), np.concatenate(([0.0], np.cumsum(y)))
+    inicio, fim = bordas[:-1], bordas[1:]
+    prox_inicio = np.append(fim[:-1], n - 1)
+    prox_fim = np.append(fim[1:], n)
+    media_x = (cx[prox_fim] - cx[prox_inicio]) / (prox_fim - prox_inicio)
+    media_y = (cy[prox_fim] - cy[prox_inicio]) / (prox_fim - prox_inicio)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        s, e = inicio[i], max(fim[i], inicio[i] + 1)
+        area = np.abs((x[a] - media_x[i]) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (media_y[i] - y[a]))
+        a = s + int(np.nanargmax(area)) if np.isfinite(area).any() else s
+        indices[i + 1] = a
+    return indices
+
+
+def minmax(y, n_out):
+    """Índices do mínimo e do máximo de cada um dos `n_out // 2` baldes (totalmente vetorizado)."""
+    n = len(y)
+    baldes = max(1, n_out // 2)
+    if n <= n_out:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    tamanho = n // baldes
+    corpo = np.where(np.isnan(y[:tamanho * baldes]), np.nanmean(y), y[:tamanho * baldes]).reshape(baldes, tamanho)
+    base = np.arange(baldes) * tamanho
+    indices = np.concatenate((base + corpo.argmin(axis=1), base + corpo.argmax(axis=1), [0, n - 1]))
+    return np.unique(indices)
+
+
+def decimate(x, y, n_out, metodo="lttb"):
+    """Devolve (x, y) reduzidos a aproximadamente `n_out` pontos, ignorando NaN."""
+    x, y = np.asarray(x), np.asarray(y)
+    validos = ~np.isnan(y)
+    x, y = x[validos], y[validos]
+    indices = lttb(x, y, n_out) if metodo == "lttb" else minmax(y, n_out)
+    return x[indices], y[indices]
+
+
+def relative_chart(basef, colunas, inicio, fim, pontos=1500, destaque="brent"):
+    """Figura Plotly (Scattergl) das `colunas` normalizadas (base 1.0 no início do intervalo)."""
+    import plotly.graph_objects as go
+
+    from petroleo.esquema import LABELS
+
+    janela = basef[(basef['Date'] >= inicio) & (basef['Date'] <= fim)]
+    datas = janela['Date'].to_numpy()
+    fig = go.Figure()
+    for col in colunas:
+        valores = janela[col].to_numpy(dtype='float64')
+        primeiro = valores[~np.isnan(valores)][:1]
+        if not len(primeiro):
+            continue
+        # Normalização e decimação para a largura do gráfico
+        x, y = decimate(datas, valores / primeiro[0], pontos)
+        principal = col == destaque
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode='lines', name=LABELS.get(col, col),
+            line=dict(width=2.5 if principal else 1.5, color='red' if principal else None),
+            opacity=1.0 if principal else 0.7,
+        ))
+    fig.update_layout(
+        title="Variação Relativa das Variáveis ao Longo do Tempo",
+        xaxis_title="Ano",
+        yaxis_title="Variação Relativa (Base 1.0)",
+        legend=dict(x=0, y=1),
+        height=600,
+    )
+    return fig
+
+
+def correlation_heatmap(matriz, titulo, texto=None, altura=450):
+    """Mapa de calor de uma matriz de correlação (escala fixa de -1 a 1); `texto` substitui os rótulos das células."""
+    import plotly.graph_objects as go
+
+    from petroleo.esquema import LABELS
+
+    nomes = [LABELS.get(c, c) for c in matriz.columns]
+    rotulos = np.char.mod("%.2f", matriz.to_numpy()) if texto is None else texto.to_numpy()
+    fig = go.Figure(go.Heatmap(
+        z=matriz.to_numpy(), x=nomes, y=nomes, zmin=-1, zmax=1, colorscale="RdBu",
+        text=rotulos, texttemplate="%{text}", hovertemplate="%{y} × %{x}: %{z:.2f}<extra></extra>",
+    ))
+    fig.update_layout(title=titulo, height=altura, yaxis=dict(autorange="reversed"))
+    return fig
+
+
+def rolling_correlation_chart(tabela, pontos=1500):
+    """Correlação móvel ao longo do tempo (uma linha por coluna de `tabela`), decimada para a largura do gráfico."""
+    import plotly.graph_objects as go
+
+    from petroleo.esquema import LABELS
+
+    fig = go.Figure()
+    datas = tabela.index.to_numpy()
+    for col in tabela.columns:
+        x, y = decimate(datas, tabela[col].to_numpy(dtype="float64"), pontos)
+        fig.add_trace(go.Scattergl(x=x, y=y, mode="lines", name=LABELS.get(col, col)))
+    fig.update_layout(xaxis_title="Ano", yaxis_title="Correlação", yaxis=dict(range=[-1, 1]),
+                      legend=dict(x=0, y=1), height=400)
+    return fig
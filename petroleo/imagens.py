@@ -0,0 +1,153 @@
+"""Variantes responsivas (WebP/AVIF em várias larguras) das imagens estáticas.
+
+Cada imagem vira `static/img/<nome>-<hash>-<largura>w.<formato>`, com o
+hash do conteúdo no nome: uma imagem alterada gera arquivos novos e as
+antigas nunca são servidas por engano. As variantes são geradas no primeiro
+uso (ou antes, com `python -m petroleo.imagens`) e servidas pelo static
+serving do Streamlit (`app/static/...`). O navegador escolhe a menor
+variante que cobre a largura do contêiner (`srcset`/`sizes`) e as imagens
+abaixo da dobra carregam só quando ficam visíveis (`loading="lazy"`).
+"""
+import argparse
+import functools
+import hashlib
+import os
+from dataclasses import dataclass
+from html import escape
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT / "static" / "img"
+STATIC_URL = "app/static/img"
+LARGURAS = (480, 800, 1200, 1600)
+# O static serving do Streamlit só envia Content-Type de imagem para .jpg/.png/.gif/.webp;
+# AVIF é gerado sob demanda (--avif), mas as páginas servem WebP.
+FORMATOS = ("webp",)
+QUALIDADE = {"webp": 80, "avif": 60}
+MIME = {"webp": "image/webp", "avif": "image/avif"}
+ASSETS = [
+    "img_IA.png",
+    "analise_petroleo_media_preco_por_ano.jpg",
+    "analise_petroleo_influencia_aumento_preco.jpg",
+    "analise_petroleo_influencia_diminuicao_preco.jpg",
+    "analise_petroleo_media_preco_primavera_arabe.jpg",
+]
+
+
+@dataclass
+class Variant:
+    path: Path
+    width: int
+    height: int
+    formato: str
+
+    @property
+    def url(self):
+        return f"{STATIC_URL}/{self.path.name}"
+
+    @property
+    def bytes(self):
+        return self.path.stat().st_size
+
+
+def content_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()[:12]
+
+
+def avif_supported():
+    try:
+        from PIL import features
+
+        return bool(features.check("avif"))
+    except (ImportError, ValueError):
+        return False
+
+
+def build_variants(origem, larguras=LARGURAS, formatos=FORMATOS, destino=STATIC_DIR):
+    """Gera (ou reaproveita do disco) as variantes de `origem`; larguras acima da original são ignoradas."""
+    from PIL import Image
+
+    origem = Path(origem)
+    destino = Path(destino)
+    prefixo = f"{origem.stem}-{content_hash(origem)}"
+    formatos = [f for f in formatos if f != "avif" or avif_supported()]
+    variantes = []
+    with Image.open(origem) as imagem:
+        largura_original, altura_original = imagem.size
+        alvos = sorted({min(l, largura_original) for l in larguras})
+        for formato in formatos:
+            for largura in alvos:
+                altura = round(altura_original * largura / largura_original)
+                path = destino / f"{prefixo}-{largura}w.{formato}"
+                if not path.exists():
+                    destino.mkdir(parents=True, exist_ok=True)
+                    reduzida = imagem.convert("RGB").resize((largura, altura), Image.LANCZOS)
+                    tmp = path.with_name(f".{path.name}.tmp")
+                    reduzida.save(tmp, format=formato.upper(), quality=QUALIDADE[formato], method=6)
+                    os.replace(tmp, path)
+                variantes.append(Variant(path, largura, altura, formato))
+    return variantes
+
+
+def pick_variant(variantes, largura_css, dpr=1.0, formato="webp"):
+    """Menor variante com largura >= `largura_css * dpr` (ou a maior, se nenhuma cobrir)."""
+    candidatas = sorted((v for v in variantes if v.formato == formato), key=lambda v: v.width)
+    necessaria = largura_css * dpr
+    return next((v for v in candidatas if v.width >= necessaria), candidatas[-1])
+
+
+@functools.lru_cache(maxsize=64)
+def _picture_html(origem, mtime_ns, legenda, sizes, lazy):
+    variantes = build_variants(origem)
+    fontes = []
+    for formato in sorted({v.formato for v in variantes}, key=lambda f: f != "avif"):
+        srcset = ", ".join(f"{v.url} {v.width}w" for v in variantes if v.formato == formato)
+        fontes.append(f'<source type="{MIME[formato]}" srcset="{srcset}" sizes="{sizes}">')
+    padrao = pick_variant(variantes, 800)
+    carregamento = 'loading="lazy" decoding="async"' if lazy else 'loading="eager" fetchpriority="high"'
+    texto = escape(legenda)
+    return (
+        '<figure style="margin: 0 0 1rem 0;">'
+        f'<picture>{"".join(fontes)}'
+        f'<img src="{padrao.url}" width="{padrao.width}" height="{padrao.height}" alt="{texto}" {carregamento} '
+        'style="width: 100%; height: auto;"></picture>'
+        '<figcaption style="text-align: center; font-size: 14px; color: rgba(250, 250, 250, 0.6);">'
+        f'{texto}</figcaption></figure>'
+    )
+
+
+def picture_html(origem, legenda="", sizes="100vw", lazy=True):
+    origem = ROOT / origem
+    return _picture_html(str(origem), origem.stat().st_mtime_ns, legenda, sizes, lazy)
+
+
+def show_image(origem, caption="", sizes="(min-width: 1024px) calc(100vw - 336px), 100vw", lazy=True):
+    """Substituto de `st.image(..., use_container_width=True)` com variantes responsivas."""
+    import streamlit as st
+
+    try:
+        html = picture_html(origem, caption, sizes, lazy)
+    except ImportError:
+        # Sem Pillow: imagem original, como antes
+        st.image(str(ROOT / origem), caption=caption, use_container_width=True)
+        return
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as variantes responsivas das imagens estáticas")
+    parser.add_argument("--avif", action="store_true", help="gera também variantes AVIF (Pillow com suporte)")
+    args = parser.parse_args()
+    formatos = FORMATOS + (("avif",) if args.avif else ())
+    for nome in ASSETS:
+        variantes = build_variants(ROOT / nome, formatos=formatos)
+        tamanhos = ", ".join(f"{v.width}w.{v.formato}={v.bytes / 1024:.0f} KB" for v in variantes)
+        print(f"{nome} ({(ROOT / nome).stat().st_size / 1024:.0f} KB): {tamanhos}")
+
+
+if __name__ == "__main__":
+    main()
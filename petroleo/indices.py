@@ -0,0 +1,59 @@
+"""Montagem da base da página de índices: Brent, S&P 500, ouro, DXY e TASI alinhados."""
+import os
+
+import pandas as pd
+
+from petroleo.alinhamento import align
+from petroleo.armazenamento import default_store
+from petroleo.coleta import fetch_all, timings
+from petroleo.fontes import SOURCES_DIR, CsvSource
+
+TICKERS = {"Brent": "BZ=F", "S&P500": "^GSPC", "Gold": "IAU", "Índice DXY": "DX-Y.NYB"}
+TASI_URL = 'https://raw.githubusercontent.com/ntfcamargo/Base-TECH-CHALLENGE-3/refs/heads/main/Dados%20Hist%C3%B3ricos%20-%20Tadawul%20All%20Share.csv'
+
+
+# CSV exportado em português (Data, Último; "11.234,56"), com espelho local para quando a rede falha
+TASI_SOURCE = CsvSource("tasi", TASI_URL,
+                        mirror=os.environ.get("PETROLEO_TASI_MIRROR", SOURCES_DIR / "espelho" / "tasi.csv"))
+
+
+def carregar_tasi(transport=None, source=None):
+    return (source if source is not None else TASI_SOURCE).load(transport)
+
+
+def load_indices(store=None, transport=None, tasi_source=None):
+    """Devolve (base alinhada com chaves curtas em float32, tempos de coleta por fonte).
+
+    `tasi_source` substitui `TASI_SOURCE` (cache e espelho em outro diretório, ex.: benchmarks).
+    """
+    store = store if store is not None else default_store()
+
+    # Todas as fontes são buscadas em paralelo; uma fonte lenta ou com erro não bloqueia as demais
+    tarefas = {nome: (lambda t=ticker: store.load(t)) for nome, ticker in TICKERS.items()}
+    tarefas["TASI"] = lambda: carregar_tasi(transport, tasi_source)
+    resultados = fetch_all(tarefas, timeout=30, retries=2)
+    if not resultados["Brent"].ok:
+        raise RuntimeError(f"Falha ao obter o preço do Brent: {resultados['Brent'].error}")
+
+    vazio = pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'Close': pd.Series(dtype='float64')})
+    brent = resultados["Brent"].value
+    sp500 = resultados["S&P500"].value if resultados["S&P500"].ok else vazio
+    gold = resultados["Gold"].value if resultados["Gold"].ok else vazio
+    dxy = resultados["Índice DXY"].value if resultados["Índice DXY"].ok else vazio
+    tasi = resultados["TASI"].value if resultados["TASI"].ok else vazio
+
+    # Alinhar todas as séries nas datas do Brent em uma única passada (float32, chaves curtas;
+    # os rótulos em português são aplicados só na exibição)
+    base = align({
+        'brent': brent,
+        'sp500': sp500,
+        'gold': gold,
+        'dxy': dxy,
+        'tasi': tasi,
+    }, base='brent', dtype='float32').reset_index()
+
+    base.insert(5, 'retorno', base['brent'].pct_change().fillna(0).astype('float32'))
+
+    basef = base[base['Date'] > '2005-12-31'].reset_index(drop=True)
+
+    return basef, timings(resultados)
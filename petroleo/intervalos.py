@@ -0,0 +1,123 @@
+"""Intervalos de previsão em torno da previsão servida: boosting por quantis e ensemble bootstrap.
+
+As bandas são sempre centradas no caminho do modelo que a página e a API
+servem (o artefato pré-treinado ou o do registro): os métodos só estimam a
+largura da banda, somada ao caminho servido. Assim a linha de previsão fica
+sempre dentro da faixa.
+
+- "quantil": um único booster `reg:quantileerror` com vários `quantile_alpha`
+  prevê os três quantis de uma vez, com o lag do caminho servido; a distância
+  dos quantis extremos até a mediana vira a largura da banda.
+- "bootstrap": B boosters treinados cada um numa reamostragem com reposição
+  das linhas de treino (os parâmetros, inclusive `subsample`, são os do
+  modelo servido), em threads (o treino do XGBoost libera o GIL), e cada
+  membro ocupa uma vaga do agendador de treino. Cada um gera caminhos
+  recursivos com choques reamostrados dos seus resíduos fora da amostra; a
+  dispersão dos caminhos em torno da mediana de cada membro vira a largura.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from petroleo.features import SELECTED_FEATURES
+from petroleo.previsao import recursive_forecast
+from petroleo.treino import default_scheduler
+
+
+@dataclass
+class IntervalForecast:
+    dates: pd.DatetimeIndex
+    lower: np.ndarray
+    median: np.ndarray
+    upper: np.ndarray
+    nivel: float
+    metodo: str
+
+    def to_frame(self):
+        return pd.DataFrame({"Inferior": self.lower, "Mediana": self.median, "Superior": self.upper}, index=self.dates)
+
+
+def _base_params(params):
+    return {"tree_method": "hist", **{k: v for k, v in (params or {}).items() if k != "objective"}}
+
+
+def _around(datas, caminho, inferior, superior, nivel, metodo):
+    """Banda = caminho servido + desvios `inferior` (<= 0) e `superior` (>= 0)."""
+    caminho = np.asarray(caminho, dtype=np.float32)
+    return IntervalForecast(datas, caminho + np.minimum(inferior, 0), caminho, caminho + np.maximum(superior, 0),
+                            nivel, metodo)
+
+
+def _centered(datas, caminho, desvios, nivel, metodo):
+    """Banda = caminho servido + quantis da amostra de `desvios` (horizonte, amostras) em torno de zero."""
+    inferior, superior = np.quantile(desvios, [(1 - nivel) / 2, (1 + nivel) / 2], axis=1)
+    return _around(datas, caminho, inferior, superior, nivel, metodo)
+
+
+def quantile_intervals(x_train, y_train, caminho, ultimo_preco, datas, nivel=0.9, params=None, num_boost_round=300):
+    """Bandas por regressão quantílica em torno de `caminho` (previsão do modelo servido em `datas`)."""
+    import xgboost as xgb
+
+    alfas = np.array([(1 - nivel) / 2, 0.5, (1 + nivel) / 2])
+
+    def treinar(nthread):
+        dtrain = xgb.QuantileDMatrix(x_train, label=y_train, nthread=nthread)
+        return xgb.train({**_base_params(params), "objective": "reg:quantileerror", "quantile_alpha": alfas,
+                          "nthread": nthread}, dtrain, num_boost_round=num_boost_round)
+
+    booster = default_scheduler().run(treinar)
+
+    datas = pd.DatetimeIndex(datas)
+    bandas = np.empty((len(datas), 3), dtype=np.float32)
+    # O lag de cada passo é o do caminho servido, não a mediana do modelo quantílico
+    lags = np.concatenate([[float(ultimo_preco)], np.asarray(caminho, dtype=np.float32)[:-1]])
+    for t in range(len(datas)):
+        linha = {"Ano": datas[t].year, "Mês": datas[t].month, "Dia": datas[t].day,
+                 "Dia_Semana": datas[t].weekday(), "dia_anterior": lags[t]}
+        X = np.array([[linha[f] for f in SELECTED_FEATURES]], dtype=np.float32)
+        bandas[t] = np.sort(booster.inplace_predict(X).reshape(-1))
+    # Os quantis extremos já são as bordas da banda: só a distância até a mediana é usada
+    return _around(datas, caminho, bandas[:, 0] - bandas[:, 1], bandas[:, 2] - bandas[:, 1], nivel, "quantil")
+
+
+def bootstrap_intervals(x_train, y_train, x_val, y_val, caminho, ultimo_preco, datas, nivel=0.9, params=None,
+                        num_boost_round=300, membros=16, caminhos=2000, seed=0, scheduler=None):
+    """Bandas por ensemble bootstrap em torno de `caminho` (previsão do modelo servido em `datas`)."""
+    import xgboost as xgb
+
+    scheduler = scheduler or default_scheduler()
+
+    # Os cortes do histograma saem uma vez da matriz completa; cada membro só reamostra as linhas
+    X_train = np.asarray(x_train, dtype=np.float32)
+    y_train = np.asarray(y_train, dtype=np.float32)
+    completa = xgb.QuantileDMatrix(X_train, label=y_train, nthread=scheduler.total_threads)
+    X_val = np.asarray(x_val, dtype=np.float32)
+    y_val = np.asarray(y_val, dtype=np.float32)
+
+    def treinar_membro(i, nthread):
+        linhas = np.random.default_rng(seed + i).integers(0, len(X_train), size=len(X_train))
+        dtrain = xgb.QuantileDMatrix(X_train[linhas], label=y_train[linhas], ref=completa, nthread=nthread)
+        membro_params = {**_base_params(params), "objective": "reg:squarederror", "seed": seed + i,
+                         "nthread": nthread}
+        booster = xgb.train(membro_params, dtrain, num_boost_round=num_boost_round)
+        return booster, y_val - booster.inplace_predict(X_val)
+
+    def treinar(i):
+        return scheduler.run(lambda nthread: treinar_membro(i, nthread))
+
+    with ThreadPoolExecutor(max_workers=min(membros, scheduler.max_jobs)) as pool:
+        membros_treinados = list(pool.map(treinar, range(membros)))
+
+    rng = np.random.default_rng(seed)
+    datas = pd.DatetimeIndex(datas)
+    por_membro = max(1, caminhos // membros)
+    desvios = []
+    for booster, residuos in membros_treinados:
+        choques = rng.choice(residuos, size=(len(datas), por_membro)).astype(np.float32)
+        inicio = np.full(por_membro, ultimo_preco, dtype=np.float32)
+        trajetorias = recursive_forecast(booster, inicio, datas, SELECTED_FEATURES, choques)
+        # Só a dispersão de cada membro importa: o nível vem do modelo servido
+        desvios.append(trajetorias - np.median(trajetorias, axis=1, keepdims=True))
+    return _centered(datas, caminho, np.hstack(desvios), nivel, "bootstrap")
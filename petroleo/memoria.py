@@ -0,0 +1,66 @@
+"""Instrumentação de memória do processo e controle do ciclo de vida de figuras."""
+import gc
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+def rss_bytes():
+    """Memória residente atual do processo (psutil, se instalado; senão /proc)."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import os
+
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def sizeof(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        uso = obj.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(uso, pd.Series) else uso)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    return sys.getsizeof(obj)
+
+
+def open_figures():
+    """Figuras matplotlib ainda abertas (0 se o pyplot nem foi importado)."""
+    plt = sys.modules.get("matplotlib.pyplot")
+    return len(plt.get_fignums()) if plt is not None else 0
+
+
+def close_figures():
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        plt.close("all")
+
+
+def memory_report(objetos=None):
+    """Resumo da memória do processo e dos objetos compartilhados informados."""
+    linhas = [
+        {"Item": "RSS do processo", "Valor": f"{rss_bytes() / 1024 ** 2:.1f} MB"},
+        {"Item": "Pico de RSS", "Valor": f"{peak_rss_bytes() / 1024 ** 2:.1f} MB"},
+        {"Item": "Figuras matplotlib abertas", "Valor": str(open_figures())},
+        {"Item": "Objetos rastreados pelo GC", "Valor": f"{len(gc.get_objects()):,}"},
+    ]
+    for nome, obj in (objetos or {}).items():
+        linhas.append({"Item": nome, "Valor": f"{sizeof(obj) / 1024 ** 2:.2f} MB"})
+    return pd.DataFrame(linhas)
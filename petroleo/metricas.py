@@ -0,0 +1,13 @@
+"""Métricas de erro das previsões."""
+import numpy as np
+
+
+def calculate_metrics(y_true, y_pred):
+    # scikit-learn só é importado no primeiro cálculo (ver petroleo.aquecimento)
+    from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, mean_squared_error
+
+    mae = mean_absolute_error(y_true, y_pred)
+    mse = mean_squared_error(y_true, y_pred)
+    rmse = np.sqrt(mse)
+    mape = mean_absolute_percentage_error(y_true, y_pred) * 100
+    return mae, mse, rmse, mape
@@ -0,0 +1,123 @@
+"""Registro de modelos treinados, indexado pelos dados e hiperparâmetros.
+
+Cada modelo é guardado sob o hash (impressão digital dos dados de treino +
+todos os hiperparâmetros). Configurações idênticas reutilizam o modelo;
+configurações novas são treinadas uma única vez, mesmo com várias sessões
+pedindo o mesmo modelo ao mesmo tempo. A remoção é LRU, limitada por
+quantidade de itens e por orçamento de memória.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+
+def fingerprint(*frames):
+    """Hash estável do conteúdo (valores + índice) de DataFrames/Series."""
+    h = hashlib.sha256()
+    for frame in frames:
+        h.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        if isinstance(frame, pd.DataFrame):
+            h.update("|".join(map(str, frame.columns)).encode())
+    return h.hexdigest()
+
+
+def model_key(data_fingerprint, params):
+    payload = json.dumps({"data": data_fingerprint, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def booster_size(model):
+    try:
+        return len(model.save_raw())
+    except AttributeError:
+        return 0
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    items: int = 0
+    bytes: int = 0
+    train_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ModelRegistry:
+    def __init__(self, max_items=32, max_bytes=256 * 1024 ** 2, sizeof=booster_size):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._items = OrderedDict()  # chave -> (modelo, bytes, segundos de treino)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = RegistryStats()
+
+    def get_or_train(self, key, train):
+        """Devolve o modelo de `key`, treinando com `train()` apenas na primeira vez."""
+        with self._lock:
+            if key in self._items:
+                return self._hit(key)
+            evento = self._inflight.get(key)
+            dono = evento is None
+            if dono:
+                evento = self._inflight[key] = threading.Event()
+
+        if not dono:
+            # Outra sessão já está treinando este modelo: aguarda e reaproveita
+            evento.wait()
+            with self._lock:
+                if key in self._items:
+                    return self._hit(key)
+            return self.get_or_train(key, train)
+
+        try:
+            inicio = time.perf_counter()
+            modelo = train()
+            segundos = time.perf_counter() - inicio
+            with self._lock:
+                self._stats.misses += 1
+                self._stats.train_seconds += segundos
+                self._put(key, modelo, segundos)
+            return modelo
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            evento.set()
+
+    def _hit(self, key):
+        modelo, _, segundos = self._items[key]
+        self._items.move_to_end(key)
+        self._stats.hits += 1
+        self._stats.saved_seconds += segundos
+        return modelo
+
+    def _put(self, key, modelo, segundos):
+        tamanho = self.sizeof(modelo)
+        self._items[key] = (modelo, tamanho, segundos)
+        self._stats.bytes += tamanho
+        while len(self._items) > 1 and (len(self._items) > self.max_items or self._stats.bytes > self.max_bytes):
+            _, (_, liberado, _) = self._items.popitem(last=False)
+            self._stats.bytes -= liberado
+            self._stats.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            self._stats.items = len(self._items)
+            return RegistryStats(**asdict(self._stats))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._stats.bytes = 0
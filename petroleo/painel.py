@@ -0,0 +1,44 @@
+"""Painel de desempenho (oculto): aberto em `App.py?painel=desempenho`."""
+import pandas as pd
+
+from petroleo import telemetria
+from petroleo.memoria import rss_bytes
+from petroleo.treino import default_scheduler
+
+
+def cache_table(metricas):
+    """Acertos e falhas por cache a partir dos contadores de chamadas e de execuções do corpo."""
+    chamadas = metricas[metricas["Métrica"] == "petroleo_cache_calls_total"].set_index("Rótulos")["Contagem"]
+    falhas = metricas[metricas["Métrica"] == "petroleo_cache_misses_total"].set_index("Rótulos")["Contagem"]
+    tabela = pd.DataFrame({"Chamadas": chamadas, "Falhas": falhas}).fillna(0)
+    tabela["Acertos"] = tabela["Chamadas"] - tabela["Falhas"]
+    tabela["Taxa de acerto"] = (tabela["Acertos"] / tabela["Chamadas"].where(tabela["Chamadas"] > 0)).fillna(0)
+    return tabela.rename_axis("Cache").reset_index()
+
+
+def show_panel():
+    import streamlit as st
+
+    st.markdown('<h2>⏱️ Desempenho</h2>', unsafe_allow_html=True)
+    if not telemetria.ATIVA:
+        st.info("Telemetria desativada (PETROLEO_TELEMETRIA=0).")
+        return
+
+    metricas = telemetria.snapshot()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Memória residente", f"{rss_bytes() / 2 ** 20:.0f} MB")
+    col2.metric("Reruns desta sessão", st.session_state.get("_reruns", 0))
+    agendador = default_scheduler().stats()
+    col3.metric("Treinos ativos / na fila", f"{agendador['ativos']} / {agendador['na_fila']}")
+
+    st.subheader("Caches do Streamlit")
+    st.dataframe(cache_table(metricas), hide_index=True, use_container_width=True)
+
+    st.subheader("Tempos e contadores")
+    st.dataframe(metricas, hide_index=True, use_container_width=True)
+
+    st.download_button("Baixar no formato Prometheus", telemetria.prometheus_text(), file_name="metrics.txt",
+                       mime="text/plain")
+    if st.button("Zerar métricas"):
+        telemetria.reset()
+        st.rerun()
@@ -0,0 +1,57 @@
+"""Previsão recursiva de vários passos com inferência em lote.
+
+Cada previsão vira o `dia_anterior` do passo seguinte. Vários cenários
+(caminhos) são previstos juntos: todos os caminhos do passo t vão em uma
+única chamada `inplace_predict`.
+"""
+import numpy as np
+import pandas as pd
+
+CALENDARIO = {
+    "Ano": lambda d: d.year,
+    "Mês": lambda d: d.month,
+    "Dia": lambda d: d.day,
+    "Dia_Semana": lambda d: d.weekday,
+}
+LAG = "dia_anterior"
+
+
+def future_dates(ultima_data, dias):
+    return pd.date_range(start=pd.Timestamp(ultima_data) + pd.Timedelta(days=1), periods=dias, freq="D")
+
+
+def future_trading_dates(ultima_data, dias):
+    """Próximos `dias` pregões (dias úteis): um passo por pregão, como nos modelos de séries temporais."""
+    return pd.bdate_range(start=pd.Timestamp(ultima_data) + pd.Timedelta(days=1), periods=dias)
+
+
+def recursive_forecast(booster, ultimo_preco, datas, features, shocks=None):
+    """Prevê `len(datas)` passos para um ou mais caminhos.
+
+    `ultimo_preco` é um escalar ou um array (n_caminhos,) de preços iniciais.
+    `shocks`, opcional, tem forma (horizonte, n_caminhos) e é somado a cada
+    previsão antes de realimentar o lag (ex.: resíduos reamostrados).
+    Devolve um array (horizonte, n_caminhos).
+    """
+    datas = pd.DatetimeIndex(datas)
+    inicio = np.atleast_1d(np.asarray(ultimo_preco, dtype=np.float32))
+    horizonte, caminhos = len(datas), len(inicio)
+
+    # Features de calendário são as mesmas para todos os caminhos: calculadas uma vez
+    X = np.empty((caminhos, len(features)), dtype=np.float32)
+    calendario = [(features.index(nome), np.asarray(f(datas), dtype=np.float32))
+                  for nome, f in CALENDARIO.items() if nome in features]
+    col_lag = features.index(LAG)
+
+    saida = np.empty((horizonte, caminhos), dtype=np.float32)
+    lag = inicio
+    for t in range(horizonte):
+        for col, valores in calendario:
+            X[:, col] = valores[t]
+        X[:, col_lag] = lag
+        pred = booster.inplace_predict(X)
+        if shocks is not None:
+            pred = pred + shocks[t]
+        saida[t] = pred
+        lag = pred
+    return saida
@@ -0,0 +1,267 @@
+"""Vários modelos de previsão (XGBoost, ARIMA, ETS, Prophet) ajustados em paralelo e combinados.
+
+Cada backend implementa `Forecaster.fit(serie)` / `predict(datas)`. `ForecastZoo`
+ajusta cada modelo pedido em um processo próprio (spawn), com até tantos
+processos simultâneos quanto as vagas reservadas no agendador de treino.
+Cada modelo tem seu orçamento de tempo, contado de quando o processo dele
+começa: quem estoura o orçamento fica de fora e o processo é encerrado.
+Cada modelo é ajustado duas vezes no mesmo processo: sem os últimos
+`validacao` pregões (para medir o MAE fora da amostra) e com a série toda
+(para a previsão). Todos os modelos preveem as mesmas datas, um passo por
+pregão: na validação, as datas reais dos pregões separados; na previsão, os
+próximos dias úteis. O ensemble pondera as previsões pelo inverso do MAE.
+
+Os ajustes bem-sucedidos ficam em cache por (versão dos dados, modelo):
+comparar modelos custa o tempo do modelo mais lento, e só na primeira vez.
+Falhas e estouros de orçamento não entram no cache: a próxima comparação
+tenta de novo.
+"""
+import pickle
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from petroleo.features import SELECTED_FEATURES, TARGET, compute_features
+from petroleo.modelos import fingerprint
+from petroleo.previsao import future_trading_dates, recursive_forecast
+from petroleo.treino import TrainingScheduler, default_scheduler, set_default_scheduler, spawn_context
+
+
+class Forecaster:
+    """Interface dos backends: `fit` recebe a série de fechamento (índice de datas)."""
+
+    nome = "base"
+
+    def fit(self, serie):
+        raise NotImplementedError
+
+    def predict(self, datas):
+        """Previsão para `datas`: os próximos `len(datas)` pregões depois do fim da série ajustada."""
+        raise NotImplementedError
+
+
+class XGBoostForecaster(Forecaster):
+    nome = "XGBoost"
+
+    def __init__(self, params=None, num_boost_round=300):
+        self.params = {"objective": "reg:squarederror", "learning_rate": 0.1, "max_depth": 6, **(params or {})}
+        self.num_boost_round = num_boost_round
+
+    def fit(self, serie):
+        from petroleo.treino import train_booster
+
+        base = compute_features(serie)
+        corte = int(len(base) * 0.9)
+        x, y = base[SELECTED_FEATURES], base[TARGET]
+        self.booster = train_booster(x.iloc[:corte], y.iloc[:corte], x.iloc[corte:], y.iloc[corte:], self.params,
+                                     self.num_boost_round)
+        self.ultimo_preco = float(serie.iloc[-1])
+        return self
+
+    def predict(self, datas):
+        return recursive_forecast(self.booster, self.ultimo_preco, datas, SELECTED_FEATURES)[:, 0]
+
+
+class ARIMAForecaster(Forecaster):
+    """ARIMA sobre o log do preço (statsmodels)."""
+
+    nome = "ARIMA"
+
+    def __init__(self, order=(1, 1, 1)):
+        self.order = order
+
+    def fit(self, serie):
+        from statsmodels.tsa.arima.model import ARIMA
+
+        self.resultado = ARIMA(np.log(serie.to_numpy(dtype="float64")), order=self.order).fit()
+        return self
+
+    def predict(self, datas):
+        return np.exp(self.resultado.forecast(steps=len(datas)))
+
+
+class ETSForecaster(Forecaster):
+    """Suavização exponencial com tendência amortecida (statsmodels)."""
+
+    nome = "ETS"
+
+    def fit(self, serie):
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+        self.resultado = ExponentialSmoothing(serie.to_numpy(dtype="float64"), trend="add",
+                                              damped_trend=True).fit()
+        return self
+
+    def predict(self, datas):
+        return np.asarray(self.resultado.forecast(len(datas)))
+
+
+class ProphetForecaster(Forecaster):
+    nome = "Prophet"
+
+    def fit(self, serie):
+        from prophet import Prophet
+
+        self.modelo = Prophet(daily_seasonality=False, weekly_seasonality=True, yearly_seasonality=True)
+        self.modelo.fit(pd.DataFrame({"ds": serie.index, "y": serie.to_numpy(dtype="float64")}))
+        return self
+
+    def predict(self, datas):
+        futuro = pd.DataFrame({"ds": pd.DatetimeIndex(datas)})
+        return self.modelo.predict(futuro)["yhat"].to_numpy()
+
+
+FORECASTERS = {cls.nome: cls for cls in (XGBoostForecaster, ARIMAForecaster, ETSForecaster, ProphetForecaster)}
+BUDGETS = {"XGBoost": 60.0, "ARIMA": 60.0, "ETS": 30.0, "Prophet": 120.0}
+
+
+@dataclass
+class ModelFit:
+    nome: str
+    previsao: Optional[np.ndarray] = None
+    mae: float = float("nan")
+    segundos: float = 0.0
+    erro: Optional[str] = None
+    modelo: Any = field(default=None, repr=False)
+
+    @property
+    def ok(self):
+        return self.erro is None
+
+
+@dataclass
+class ZooForecast:
+    dates: pd.DatetimeIndex
+    previsoes: pd.DataFrame
+    pesos: dict
+    ajustes: list
+
+    def summary(self):
+        return pd.DataFrame([
+            {"Modelo": a.nome, "MAE (validação)": a.mae, "Peso": self.pesos.get(a.nome, 0.0),
+             "Tempo (s)": round(a.segundos, 2), "Status": "ok" if a.ok else a.erro}
+            for a in self.ajustes
+        ])
+
+
+def _ajustar(nome, serie, datas, validacao):
+    """Executado no processo filho: MAE fora da amostra + ajuste final na série completa, previsto em `datas`."""
+    inicio = time.perf_counter()
+    try:
+        teste = FORECASTERS[nome]().fit(serie.iloc[:-validacao])
+        separados = serie.iloc[-validacao:]
+        mae = float(np.mean(np.abs(np.asarray(teste.predict(separados.index)) - separados.to_numpy())))
+        modelo = FORECASTERS[nome]().fit(serie)
+        previsao = np.asarray(modelo.predict(datas), dtype="float64")
+    except Exception as exc:
+        return ModelFit(nome, segundos=time.perf_counter() - inicio, erro=f"{type(exc).__name__}: {exc}")
+    try:
+        pickle.dumps(modelo)
+    except Exception:
+        # Modelo não serializável: volta só a previsão (suficiente para o cache por versão)
+        modelo = None
+    return ModelFit(nome, previsao, mae, time.perf_counter() - inicio, modelo=modelo)
+
+
+def _processo(nome, serie, datas, validacao, nthread, fila):
+    """Alvo do processo filho: treinos do XGBoost limitados às `nthread` da vaga reservada pelo pai."""
+    set_default_scheduler(TrainingScheduler(max_jobs=1, total_threads=nthread))
+    fila.put((nome, _ajustar(nome, serie, datas, validacao)))
+
+
+def ensemble_weights(ajustes):
+    """Pesos proporcionais ao inverso do MAE de validação dos modelos que terminaram."""
+    validos = {a.nome: 1.0 / max(a.mae, 1e-9) for a in ajustes if a.ok and np.isfinite(a.mae)}
+    total = sum(validos.values())
+    return {nome: inverso / total for nome, inverso in validos.items()} if total else {}
+
+
+class ForecastZoo:
+    def __init__(self, modelos=tuple(FORECASTERS), budgets=None, horizonte=30, validacao=30, max_workers=None,
+                 max_cache=16):
+        self.modelos = list(modelos)
+        self.budgets = {**BUDGETS, **(budgets or {})}
+        self.horizonte = horizonte
+        self.validacao = validacao
+        self.max_workers = max_workers
+        self.max_cache = max_cache
+        self._ajustes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fit_missing(self, serie, versao, modelos):
+        """Ajusta os modelos sem ajuste em cache; devolve as falhas (que não entram no cache)."""
+        faltando = [m for m in modelos if (versao, m) not in self._ajustes]
+        falhas = {}
+        if not faltando:
+            return falhas
+        contexto = spawn_context()
+        fila = contexto.Queue()
+        datas = future_trading_dates(serie.index[-1], self.horizonte)
+        # Um processo por modelo (e não um Pool): cada um é encerrado sozinho ao estourar o orçamento,
+        # e o relógio de cada modelo só começa quando o processo dele começa
+        with default_scheduler().slots(min(len(faltando), self.max_workers or len(faltando))) as (vagas, nthread):
+            ativos = {}
+            try:
+                while faltando or ativos:
+                    while faltando and len(ativos) < vagas:
+                        nome = faltando.pop(0)
+                        processo = contexto.Process(target=_processo, daemon=True, name=f"zoo-{nome}",
+                                                    args=(nome, serie, datas, self.validacao, nthread, fila))
+                        processo.start()
+                        ativos[nome] = (processo, time.perf_counter())
+                    try:
+                        nome, ajuste = fila.get(timeout=0.1)
+                        # Resultado que chegou junto com o estouro do orçamento: o modelo já saiu como falha
+                        if nome in ativos:
+                            ativos.pop(nome)[0].join()
+                            self._guardar(versao, ajuste, falhas)
+                    except queue.Empty:
+                        pass
+                    agora = time.perf_counter()
+                    for nome, (processo, inicio) in list(ativos.items()):
+                        orcamento = self.budgets.get(nome, 60.0)
+                        if agora - inicio > orcamento:
+                            erro = f"tempo esgotado ({orcamento:.0f}s)"
+                        elif processo.exitcode not in (None, 0):
+                            erro = f"processo encerrado (código {processo.exitcode})"
+                        else:
+                            continue
+                        processo.terminate()
+                        processo.join()
+                        del ativos[nome]
+                        falhas[nome] = ModelFit(nome, segundos=agora - inicio, erro=erro)
+            finally:
+                for processo, _ in ativos.values():
+                    processo.terminate()
+        while len(self._ajustes) > self.max_cache:
+            self._ajustes.popitem(last=False)
+        return falhas
+
+    def _guardar(self, versao, ajuste, falhas):
+        if ajuste.ok:
+            self._ajustes[(versao, ajuste.nome)] = ajuste
+        else:
+            falhas[ajuste.nome] = ajuste
+
+    def run(self, serie, dias, modelos=None, versao=None):
+        """Previsões de cada modelo e do ensemble para os próximos `dias` pregões (até `horizonte`)."""
+        if dias > self.horizonte:
+            raise ValueError(f"dias deve ser no máximo {self.horizonte}")
+        modelos = list(modelos or self.modelos)
+        serie = serie.dropna()
+        versao = versao or fingerprint(serie.to_frame())
+        with self._lock:
+            falhas = self._fit_missing(serie, versao, modelos)
+            ajustes = [self._ajustes.get((versao, m)) or falhas[m] for m in modelos]
+        datas = future_trading_dates(serie.index[-1], dias)
+        previsoes = pd.DataFrame({a.nome: a.previsao[:dias] for a in ajustes if a.ok}, index=datas)
+        pesos = ensemble_weights(ajustes)
+        if pesos:
+            previsoes["Ensemble"] = sum(previsoes[nome] * peso for nome, peso in pesos.items())
+        return ZooForecast(datas, previsoes, pesos, ajustes)
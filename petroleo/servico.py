@@ -0,0 +1,406 @@
+"""Serviço de previsão independente do Streamlit.
+
+`ForecastService` mantém dados, features e modelos residentes em memória e
+atende previsões para qualquer horizonte. A página de previsão é um cliente
+dele. O mesmo serviço é exposto por HTTP (JSON):
+
+    GET /health
+    GET /forecast?days=N[&learning_rate=..&max_depth=..&num_boost_round=..]  (limites em PARAM_RANGES)
+    GET /forecast/batch?days=1,7,30
+
+Requisições concorrentes com a mesma configuração são agrupadas
+(`MicroBatcher`): uma única previsão recursiva com o maior horizonte atende
+todas. Previsões padrão já pré-calculadas respondem na hora, sem fila, e
+os grupos (que podem exigir treino) rodam num pool, sem bloquear a fila.
+
+Uso: python -m petroleo.servico [--host 127.0.0.1] [--port 8000]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from petroleo import telemetria
+from petroleo.agendador import RefreshScheduler
+from petroleo.ajuste import TUNED_ARTIFACT_PATH, load_best_params
+from petroleo.armazenamento import DATA_DIR, default_store
+from petroleo.artefato import ARTIFACT_PATH, compatible, load_artifact, load_metadata, warm_start
+from petroleo.features import SELECTED_FEATURES, TARGET, FeatureStore
+from petroleo.intervalos import IntervalForecast, bootstrap_intervals, quantile_intervals
+from petroleo.metricas import calculate_metrics
+from petroleo.modelos import ModelRegistry, fingerprint, model_key
+from petroleo.previsao import future_dates, recursive_forecast
+from petroleo.treino import train_booster
+
+DEFAULT_PARAMS = {"num_boost_round": 300, "learning_rate": 0.1, "max_depth": 6, "subsample": 1.0, "colsample_bytree": 1.0}
+MAX_DAYS = 365
+PRECOMPUTE_DAYS = 30  # mesmo limite do slider da página
+# Mesmos limites dos sliders da página de previsão: (tipo, mínimo, máximo)
+PARAM_RANGES = {"learning_rate": (float, 0.01, 0.8), "max_depth": (int, 1, 15), "num_boost_round": (int, 5, 1000)}
+PRECOMPUTED_DIR = DATA_DIR / "previsoes"
+
+
+def artifact_metadata():
+    """Metadados do artefato que `ForecastService.artifact` serve (o da busca automática ou o distribuído).
+
+    Só lê o `.json`: as páginas consultam sem carregar joblib/xgboost.
+    """
+    for path in (TUNED_ARTIFACT_PATH, ARTIFACT_PATH):
+        if path.exists():
+            return load_metadata(path)
+    return {}
+
+
+def default_params():
+    """Parâmetros padrão: os do modelo pré-treinado servido (que atende as requisições padrão)."""
+    return {**DEFAULT_PARAMS, **(artifact_metadata().get("params") or load_best_params() or {})}
+
+
+@dataclass
+class Forecast:
+    dates: pd.DatetimeIndex
+    values: np.ndarray
+    last_date: pd.Timestamp
+    last_price: float
+    metrics: tuple  # (mae, mse, rmse, mape) nos últimos `days` pregões
+    origem: str
+
+    def to_frame(self):
+        return pd.DataFrame({"Previsão": self.values}, index=self.dates)
+
+    @classmethod
+    def from_dict(cls, d):
+        m = d["metrics"]
+        return cls(pd.DatetimeIndex([p["date"] for p in d["forecast"]]),
+                   np.array([p["price"] for p in d["forecast"]], dtype=np.float32),
+                   pd.Timestamp(d["last_date"]), d["last_price"],
+                   (m["mae"], m["mse"], m["rmse"], m["mape"]), d["origem"])
+
+    def to_dict(self):
+        mae, mse, rmse, mape = self.metrics
+        return {
+            "last_date": str(self.last_date.date()),
+            "last_price": self.last_price,
+            "origem": self.origem,
+            "metrics": {"mae": mae, "mse": mse, "rmse": rmse, "mape": mape},
+            "forecast": [{"date": str(d.date()), "price": float(v)} for d, v in zip(self.dates, self.values)],
+        }
+
+
+class ForecastService:
+    def __init__(self, ticker="BZ=F", anos=20, store=None, registry=None, feature_store=None):
+        self.ticker = ticker
+        self.anos = anos
+        self.store = store if store is not None else default_store()
+        self.feature_store = feature_store if feature_store is not None else FeatureStore()
+        self.registry = registry if registry is not None else ModelRegistry(max_items=32, max_bytes=256 * 1024 ** 2)
+        self._lock = threading.RLock()
+        self._artifact = None
+        self._artifact_loaded = False
+        self._memo = {}
+        self._precomputed = {}
+        self._intervalos = {}
+        self.reload()
+
+    # ---- dados ----
+    def reload(self, refresh=False):
+        """Relê os preços (buscando pregões novos se `refresh`) e recalcula a cauda das features."""
+        with self._lock:
+            precos = self.store.load(self.ticker, refresh=refresh).set_index("Date")["Close"].dropna()
+            basef = self.feature_store.update(self.ticker, precos)
+            self.data = basef[basef.index > basef.index[-1] - pd.DateOffset(years=self.anos)]
+            self.version = fingerprint(self.data[[TARGET]])
+            corte = int(len(self.data) * 0.8)  # mesma divisão de train_test_split(test_size=0.2, shuffle=False)
+            x, y = self.data[SELECTED_FEATURES], self.data[TARGET]
+            self.split = (x.iloc[:corte], x.iloc[corte:], y.iloc[:corte], y.iloc[corte:])
+            self._memo.clear()
+            self._precomputed = {}
+            self._intervalos = {}
+
+    def reload_artifact(self):
+        with self._lock:
+            self._artifact_loaded = False
+            self._memo.clear()
+            self._precomputed = {}
+            self._intervalos = {}
+
+    # ---- modelos ----
+    def artifact(self):
+        """Modelo pré-treinado, carregado uma vez: o da busca automática ou o distribuído com o projeto."""
+        with self._lock:
+            if not self._artifact_loaded:
+                self._artifact = None
+                for path in (TUNED_ARTIFACT_PATH, ARTIFACT_PATH):
+                    try:
+                        self._artifact = load_artifact(path)
+                        break
+                    except Exception:
+                        continue
+                self._artifact_loaded = True
+            return self._artifact
+
+    def train(self, params, num_boost_round):
+        x_train, x_val, y_train, y_val = self.split
+
+        def treinar():
+            return train_booster(x_train, y_train, x_val, y_val, params, num_boost_round)
+
+        # A chave cobre os dados de treino/validação e todos os hiperparâmetros
+        key = model_key(fingerprint(x_train, y_train, x_val, y_val), {**params, "num_boost_round": num_boost_round})
+        return self.registry.get_or_train(key, treinar)
+
+    def model(self, params=None, usar_pretreinado=True, continuar_treino=False):
+        """Devolve (booster, origem). Sem `params` (ou com os padrão) usa o modelo pré-treinado."""
+        padrao = default_params()
+        params = {**padrao, **(params or {})}
+        num_boost_round = int(params.pop("num_boost_round"))
+        xgb_params = {"objective": "reg:squarederror", **params}
+
+        artifact = self.artifact()
+        e_padrao = params == {k: v for k, v in padrao.items() if k != "num_boost_round"} \
+            and num_boost_round == int(padrao["num_boost_round"])
+        if not (usar_pretreinado and e_padrao and artifact is not None and compatible(artifact, SELECTED_FEATURES)):
+            return self.train(xgb_params, num_boost_round), "treinado"
+        if not continuar_treino or artifact.trained_until is None:
+            return artifact.booster, f"pré-treinado {artifact.version}"
+        novos = self.data[self.data.index > artifact.trained_until]
+        if novos.empty:
+            return artifact.booster, f"pré-treinado {artifact.version}"
+        params_warm = {**xgb_params, **{k: v for k, v in artifact.params.items() if k != "num_boost_round"}}
+        key = model_key(fingerprint(novos[SELECTED_FEATURES], novos[TARGET]), {"artifact": artifact.version, **params_warm})
+        booster = self.registry.get_or_train(
+            key, lambda: warm_start(artifact, novos[SELECTED_FEATURES], novos[TARGET], params_warm))
+        return booster, f"pré-treinado {artifact.version} + {len(novos)} dias novos"
+
+    # ---- previsão ----
+    def _path(self, booster, days):
+        """Previsão recursiva memorizada por (modelo, versão dos dados); horizontes menores são prefixos."""
+        chave = (id(booster), self.version)
+        atual = self._memo.get(chave)
+        if atual is None or len(atual[1]) < days:
+            if len(self._memo) >= 64:
+                self._memo.clear()
+            datas = future_dates(self.data.index[-1], days)
+            valores = recursive_forecast(booster, self.data[TARGET].iloc[-1], datas, SELECTED_FEATURES)[:, 0]
+            atual = self._memo[chave] = (booster, datas, valores)
+        return atual[1][:days], atual[2][:days]
+
+    def intervals(self, days, metodo="bootstrap", nivel=0.9, params=None, usar_pretreinado=True,
+                  continuar_treino=False):
+        """Bandas de previsão (ver `petroleo.intervalos`) em torno do caminho do modelo servido."""
+        booster, origem = self.model(params, usar_pretreinado, continuar_treino)
+        params = {**default_params(), **(params or {})}
+        num_boost_round = int(params.pop("num_boost_round"))
+        horizonte = max(days, PRECOMPUTE_DAYS)
+        chave = (self.version, id(booster), metodo, nivel, json.dumps(params, sort_keys=True), num_boost_round)
+        with self._lock:
+            atual = self._intervalos.get(chave)
+        if atual is None or len(atual.dates) < days:
+            x_train, x_val, y_train, y_val = self.split
+            datas, caminho = self._path(booster, horizonte)
+            ultimo_preco = float(self.data[TARGET].iloc[-1])
+            if metodo == "quantil":
+                atual = quantile_intervals(x_train, y_train, caminho, ultimo_preco, datas, nivel, params,
+                                           num_boost_round)
+            else:
+                atual = bootstrap_intervals(x_train, y_train, x_val, y_val, caminho, ultimo_preco, datas, nivel,
+                                            params, num_boost_round)
+            with self._lock:
+                if len(self._intervalos) >= 16:
+                    self._intervalos.clear()
+                self._intervalos[chave] = atual
+        return IntervalForecast(atual.dates[:days], atual.lower[:days], atual.median[:days], atual.upper[:days],
+                                atual.nivel, atual.metodo)
+
+    def forecast_batch(self, days_list, params=None, usar_pretreinado=True, continuar_treino=False):
+        booster, origem = self.model(params, usar_pretreinado, continuar_treino)
+        datas, valores = self._path(booster, max(days_list))
+        x = self.data[SELECTED_FEATURES].to_numpy(dtype=np.float32)
+        y = self.data[TARGET].to_numpy()
+        resultados = []
+        for days in days_list:
+            preds_test = booster.inplace_predict(x[-days:])
+            resultados.append(Forecast(datas[:days], valores[:days], self.data.index[-1], float(y[-1]),
+                                       calculate_metrics(y[-days:], preds_test), origem))
+        return resultados
+
+    def forecast(self, days, params=None, usar_pretreinado=True, continuar_treino=False):
+        # Caminho comum (configuração padrão): consulta direta às previsões pré-calculadas
+        if params is None and usar_pretreinado and not continuar_treino:
+            pronta = self.precomputed(days)
+            if pronta is not None:
+                telemetria.incr("petroleo_forecast_precomputed_total")
+                return pronta
+        with telemetria.timer("petroleo_forecast_seconds"):
+            return self.forecast_batch([days], params, usar_pretreinado, continuar_treino)[0]
+
+    # ---- previsões pré-calculadas ----
+    def has_precomputed(self):
+        return bool(self._precomputed)
+
+    def precomputed(self, days):
+        """Previsão padrão pré-calculada para `days`, ou None."""
+        return self._precomputed.get(days)
+
+    def precompute_key(self):
+        artifact = self.artifact()
+        return f"{self.version[:16]}-{artifact.version if artifact is not None else 'treinado'}"
+
+    def precompute(self, max_days=PRECOMPUTE_DAYS, diretorio=PRECOMPUTED_DIR):
+        """Calcula (ou lê do disco) as previsões padrão de 1 a `max_days` dias."""
+        chave = self.precompute_key()
+        path = Path(diretorio) / f"{chave}.json"
+        if path.exists():
+            previsoes = [Forecast.from_dict(d) for d in json.loads(path.read_text())]
+        else:
+            previsoes = self.forecast_batch(list(range(1, max_days + 1)))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps([p.to_dict() for p in previsoes], ensure_ascii=False))
+            os.replace(tmp, path)
+        with self._lock:
+            if chave == self.precompute_key():
+                self._precomputed = {len(p.values): p for p in previsoes}
+        return chave
+
+
+class MicroBatcher:
+    """Agrupa requisições concorrentes por configuração durante `janela` segundos."""
+
+    def __init__(self, service, janela=0.002, max_workers=4):
+        self.service = service
+        self.janela = janela
+        self._pendentes = []
+        self._cond = threading.Condition()
+        # Qualquer grupo pode treinar um modelo: roda aqui, fora do laço
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="micro-batcher-treino")
+        threading.Thread(target=self._loop, daemon=True, name="micro-batcher").start()
+
+    def submit(self, days, params=None):
+        futuro = Future()
+        if not params:
+            # Via rápida: a previsão padrão pré-calculada não passa pela fila
+            pronta = self.service.precomputed(days)
+            if pronta is not None:
+                telemetria.incr("petroleo_forecast_precomputed_total")
+                futuro.set_result(pronta)
+                return futuro
+        with self._cond:
+            self._pendentes.append((days, params or {}, futuro))
+            self._cond.notify()
+        return futuro
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pendentes:
+                    self._cond.wait()
+            time.sleep(self.janela)
+            with self._cond:
+                lote, self._pendentes = self._pendentes, []
+            grupos = {}
+            for days, params, futuro in lote:
+                grupos.setdefault(json.dumps(params, sort_keys=True), []).append((days, futuro))
+            # Todo grupo vai para o pool, inclusive o padrão (sem pré-cálculo nem artefato, ele também treina)
+            for chave, itens in grupos.items():
+                self._pool.submit(self._run, itens, json.loads(chave) or None)
+
+    def _run(self, itens, params):
+        try:
+            resultados = self.service.forecast_batch([d for d, _ in itens], params)
+            for (_, futuro), resultado in zip(itens, resultados):
+                futuro.set_result(resultado)
+        except Exception as exc:
+            for _, futuro in itens:
+                futuro.set_exception(exc)
+
+
+def _parse_params(query):
+    """Parâmetros da query string; ValueError (400) se algum estiver fora dos limites da página."""
+    params = {}
+    for nome, (tipo, minimo, maximo) in PARAM_RANGES.items():
+        if nome in query:
+            valor = tipo(query[nome][0])
+            if not minimo <= valor <= maximo:
+                raise ValueError(f"{nome} deve estar entre {minimo} e {maximo}")
+            params[nome] = valor
+    return params
+
+
+def make_handler(batcher):
+    class ForecastHandler(BaseHTTPRequestHandler):
+        def _json(self, status, payload):
+            corpo = json.dumps(payload, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            try:
+                if url.path == "/metrics":
+                    corpo = telemetria.prometheus_text().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(corpo)))
+                    self.end_headers()
+                    self.wfile.write(corpo)
+                    return
+                if url.path == "/health":
+                    service = batcher.service
+                    return self._json(200, {"status": "ok", "last_date": str(service.data.index[-1].date()),
+                                            "data_version": service.version[:12]})
+                if url.path in ("/forecast", "/forecast/batch"):
+                    dias = [int(d) for d in query.get("days", ["7"])[0].split(",")]
+                    if any(d < 1 or d > MAX_DAYS for d in dias):
+                        return self._json(400, {"error": f"days deve estar entre 1 e {MAX_DAYS}"})
+                    params = _parse_params(query)
+                    futuros = [batcher.submit(d, params) for d in dias]
+                    resultados = [f.result().to_dict() for f in futuros]
+                    return self._json(200, resultados[0] if url.path == "/forecast" else resultados)
+                return self._json(404, {"error": "rota não encontrada"})
+            except ValueError as exc:
+                return self._json(400, {"error": str(exc)})
+            except Exception as exc:
+                return self._json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ForecastHandler
+
+
+def serve(host="127.0.0.1", port=8000, service=None):
+    service = service if service is not None else ForecastService()
+    # Mantém as previsões padrão pré-calculadas para a via rápida do MicroBatcher
+    RefreshScheduler(service).start()
+    batcher = MicroBatcher(service)
+    servidor = ThreadingHTTPServer((host, port), make_handler(batcher))
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP de previsão do preço do petróleo Brent")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    servidor = serve(args.host, args.port)
+    print(f"Servindo previsões em http://{args.host}:{args.port}/forecast?days=7")
+    servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
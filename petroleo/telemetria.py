@@ -0,0 +1,201 @@
+"""Contadores e tempos dos caminhos quentes do app, no formato de texto do Prometheus.
+
+Registro em memória, por processo e seguro entre threads. Cada métrica é
+identificada por nome + rótulos; `incr` soma em contadores e `observe`
+acumula contagem, soma e máximo (um resumo simples, sem quantis). O custo
+por evento é um lock e uma atualização de dicionário.
+
+No Streamlit, `track_run` conta os reruns da sessão e os bytes enviados ao
+navegador, e `cached` envolve `st.cache_data`/`st.cache_resource` para
+contar acertos e falhas. O painel fica em `App.py?painel=desempenho` e o
+texto do Prometheus em `/metrics` (API de previsão ou `PETROLEO_METRICS_PORT`).
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+ATIVA = os.environ.get("PETROLEO_TELEMETRIA", "1") != "0"
+
+_lock = threading.Lock()
+_contadores = {}
+_resumos = {}
+_servidor = None
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted((k, str(v)) for k, v in rotulos.items()))
+
+
+def incr(nome, valor=1, **rotulos):
+    if not ATIVA:
+        return
+    chave = _chave(nome, rotulos)
+    with _lock:
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+
+def observe(nome, valor, **rotulos):
+    if not ATIVA:
+        return
+    chave = _chave(nome, rotulos)
+    with _lock:
+        contagem, soma, maximo = _resumos.get(chave, (0, 0.0, 0.0))
+        _resumos[chave] = (contagem + 1, soma + valor, max(maximo, valor))
+
+
+@contextmanager
+def timer(nome, **rotulos):
+    """Mede o bloco em segundos e registra em `observe(nome, ...)`."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(nome, time.perf_counter() - inicio, **rotulos)
+
+
+def reset():
+    with _lock:
+        _contadores.clear()
+        _resumos.clear()
+
+
+def snapshot():
+    """Tabela (Métrica, Rótulos, Contagem, Soma, Média, Máximo) de todas as métricas."""
+    with _lock:
+        contadores = dict(_contadores)
+        resumos = dict(_resumos)
+    linhas = [
+        {"Métrica": nome, "Rótulos": _formatar(rotulos), "Contagem": valor, "Soma": None, "Média": None,
+         "Máximo": None}
+        for (nome, rotulos), valor in contadores.items()
+    ] + [
+        {"Métrica": nome, "Rótulos": _formatar(rotulos), "Contagem": contagem, "Soma": soma,
+         "Média": soma / contagem, "Máximo": maximo}
+        for (nome, rotulos), (contagem, soma, maximo) in resumos.items()
+    ]
+    return pd.DataFrame(linhas, columns=["Métrica", "Rótulos", "Contagem", "Soma", "Média", "Máximo"]) \
+        .sort_values(["Métrica", "Rótulos"], ignore_index=True)
+
+
+def _formatar(rotulos):
+    return ",".join(f'{k}="{v}"' for k, v in rotulos)
+
+
+def prometheus_text():
+    """Exposição no formato de texto do Prometheus (versão 0.0.4)."""
+    with _lock:
+        contadores = sorted(_contadores.items())
+        resumos = sorted(_resumos.items())
+    linhas, tipos = [], set()
+
+    def linha(nome, rotulos, valor, tipo, base=None):
+        base = base or nome
+        if base not in tipos:
+            tipos.add(base)
+            linhas.append(f"# TYPE {base} {tipo}")
+        rotulos = _formatar(rotulos)
+        linhas.append(f"{nome}{{{rotulos}}} {valor:g}" if rotulos else f"{nome} {valor:g}")
+
+    for (nome, rotulos), valor in contadores:
+        linha(nome, rotulos, valor, "counter")
+    for (nome, rotulos), (contagem, soma, _) in resumos:
+        linha(f"{nome}_count", rotulos, contagem, "summary", base=nome)
+        linha(f"{nome}_sum", rotulos, soma, "summary", base=nome)
+    for (nome, rotulos), (_, _, maximo) in resumos:
+        linha(f"{nome}_max", rotulos, maximo, "gauge")
+    return "\n".join(linhas) + "\n"
+
+
+# ---- Streamlit ----
+def cached(nome, decorador):
+    """Aplica `decorador` (st.cache_data/st.cache_resource, com ou sem argumentos) contando acertos e falhas.
+
+    O corpo da função só roda em falhas de cache; as chamadas são contadas por fora.
+    """
+    def envolver(fn):
+        @functools.wraps(fn)
+        def corpo(*args, **kwargs):
+            incr("petroleo_cache_misses_total", cache=nome)
+            return fn(*args, **kwargs)
+
+        em_cache = decorador(corpo)
+
+        @functools.wraps(fn)
+        def chamada(*args, **kwargs):
+            incr("petroleo_cache_calls_total", cache=nome)
+            return em_cache(*args, **kwargs)
+
+        chamada.clear = em_cache.clear
+        return chamada
+
+    return envolver
+
+
+def track_run(pagina):
+    """Conta o rerun desta sessão e passa a medir os bytes enviados ao navegador.
+
+    Os bytes vêm do tamanho serializado de cada mensagem que o script envia
+    (`ForwardMsg`); sem contexto do Streamlit (testes, scripts) só o rerun é contado.
+    """
+    import streamlit as st
+
+    st.session_state["_reruns"] = st.session_state.get("_reruns", 0) + 1
+    incr("petroleo_reruns_total", pagina=pagina)
+    start_metrics_server()
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        return
+    enviar = getattr(ctx, "_enqueue", None)
+    if enviar is None:
+        return
+    if getattr(enviar, "_telemetria", False):
+        enviar.pagina = pagina
+        return
+
+    def contar(msg):
+        incr("petroleo_payload_bytes_total", msg.ByteSize(), pagina=contar.pagina)
+        enviar(msg)
+
+    contar._telemetria = True
+    contar.pagina = pagina
+    ctx._enqueue = contar
+
+
+def _handler():
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port=None, host="127.0.0.1"):
+    """Sobe (uma vez por processo) o endpoint `/metrics` se `PETROLEO_METRICS_PORT` estiver definido."""
+    global _servidor
+    port = port or os.environ.get("PETROLEO_METRICS_PORT")
+    if not port or not ATIVA:
+        return None
+    with _lock:
+        if _servidor is None:
+            _servidor = ThreadingHTTPServer((host, int(port)), _handler())
+            _servidor.daemon_threads = True
+            threading.Thread(target=_servidor.serve_forever, daemon=True, name="telemetria").start()
+        return _servidor
@@ -0,0 +1,134 @@
+"""Treino com `QuantileDMatrix` + `tree_method="hist"` sob um agendador de processo.
+
+Sem controle, cada sessão do Streamlit que treina um modelo usa todos os
+núcleos, e várias sessões simultâneas disputam a CPU. O `TrainingScheduler`
+limita quantos treinos rodam ao mesmo tempo e reparte os núcleos entre eles
+(`nthread` por treino). Os demais esperam na fila. Pools de processos
+(backtest, busca de hiperparâmetros, comparação de modelos) reservam várias
+vagas de uma vez (`slots`) e criam os processos por spawn (`spawn_context`).
+"""
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from petroleo import telemetria
+
+
+class TrainingScheduler:
+    def __init__(self, max_jobs=None, total_threads=None):
+        self.total_threads = total_threads or os.cpu_count() or 1
+        self.max_jobs = max_jobs or max(1, min(4, self.total_threads // 2))
+        self.threads_per_job = max(1, self.total_threads // self.max_jobs)
+        self._slots = threading.BoundedSemaphore(self.max_jobs)
+        # Uma reserva de várias vagas por vez: duas reservas parciais nunca esperam uma pela outra
+        self._reserva = threading.Lock()
+        self._lock = threading.Lock()
+        self.ativos = 0
+        self.na_fila = 0
+        self.concluidos = 0
+        self.espera_total = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Reserva uma vaga de treino e devolve quantas threads ela pode usar."""
+        inicio = time.perf_counter()
+        with self._lock:
+            self.na_fila += 1
+        self._slots.acquire()
+        with self._lock:
+            self.na_fila -= 1
+            self.ativos += 1
+            self.espera_total += time.perf_counter() - inicio
+        try:
+            yield self.threads_per_job
+        finally:
+            with self._lock:
+                self.ativos -= 1
+                self.concluidos += 1
+            self._slots.release()
+
+    def run(self, fn):
+        """Executa `fn(nthread)` dentro de uma vaga."""
+        with self.slot() as nthread:
+            return fn(nthread)
+
+    @contextmanager
+    def slots(self, n):
+        """Reserva até `n` vagas para um pool de processos; devolve (processos, nthread por processo)."""
+        n = max(1, min(n, self.max_jobs))
+        inicio = time.perf_counter()
+        with self._lock:
+            self.na_fila += 1
+        with self._reserva:
+            for _ in range(n):
+                self._slots.acquire()
+        with self._lock:
+            self.na_fila -= 1
+            self.ativos += n
+            self.espera_total += time.perf_counter() - inicio
+        try:
+            yield n, self.threads_per_job
+        finally:
+            with self._lock:
+                self.ativos -= n
+                self.concluidos += 1
+            for _ in range(n):
+                self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {"max_jobs": self.max_jobs, "threads_por_job": self.threads_per_job, "ativos": self.ativos,
+                    "na_fila": self.na_fila, "concluidos": self.concluidos, "espera_total_s": self.espera_total}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler():
+    global _default
+    with _default_lock:
+        if _default is None:
+            max_jobs = os.environ.get("PETROLEO_MAX_TREINOS")
+            _default = TrainingScheduler(max_jobs=int(max_jobs) if max_jobs else None)
+        return _default
+
+
+def set_default_scheduler(scheduler):
+    """Troca o agendador do processo (ex.: no processo filho de um pool, limitado à sua vaga)."""
+    global _default
+    with _default_lock:
+        _default = scheduler
+
+
+def spawn_context():
+    """Contexto de multiprocessing por spawn: um fork do servidor (com várias threads) herdaria locks presos."""
+    return multiprocessing.get_context("spawn")
+
+
+def train_booster(x_train, y_train, x_val, y_val, params, num_boost_round=300, early_stopping_rounds=10,
+                  scheduler=None):
+    """Treina com matrizes quantizadas (hist) e `nthread` definido pelo agendador."""
+    import xgboost as xgb
+
+    def treinar(nthread):
+        dtrain = xgb.QuantileDMatrix(x_train, label=y_train, nthread=nthread)
+        # A validação reaproveita os cortes de histograma do treino
+        dval = xgb.QuantileDMatrix(x_val, label=y_val, ref=dtrain, nthread=nthread)
+        return xgb.train(
+            params={**params, "tree_method": "hist", "nthread": nthread},
+            dtrain=dtrain,
+            num_boost_round=num_boost_round,
+            evals=[(dval, "validation")],
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False
+        )
+
+    inicio = time.perf_counter()
+    booster = (scheduler or default_scheduler()).run(treinar)
+    telemetria.observe("petroleo_train_seconds", time.perf_counter() - inicio)
+    # Rodadas efetivamente usadas (a parada antecipada costuma cortar antes de num_boost_round)
+    telemetria.observe("petroleo_train_rounds", booster.num_boosted_rounds())
+    return booster
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from petroleo.correlacao import JANELAS, CorrelationEngine, lag_limit
+
+
+def _basef(dias=900, seed=0):
+    rng = np.random.default_rng(seed)
+    retornos = rng.normal(0, 0.02, size=(dias, 2))
+    niveis = 100 * np.exp(np.cumsum(retornos, axis=0))
+    return pd.DataFrame({"Date": pd.bdate_range("2020-01-01", periods=dias), "brent": niveis[:, 0],
+                         "sp500": niveis[:, 1]})
+
+
+@pytest.mark.parametrize("janela", list(JANELAS))
+def test_lead_lag_propria_serie_pico_na_defasagem_zero(janela):
+    engine = CorrelationEngine(_basef())
+    pico, defasagem = engine.lead_lag(janela)
+    assert (np.diag(defasagem.to_numpy()) == 0).all()
+    np.testing.assert_allclose(np.diag(pico.to_numpy()), 1.0)
+    assert np.abs(defasagem.to_numpy()).max() <= lag_limit(janela)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from petroleo.eventos import EVENTOS, EventAnalytics
+
+
+def _precos(inicio="2007-01-01", fim="2023-12-31", seed=0):
+    rng = np.random.default_rng(seed)
+    datas = pd.bdate_range(inicio, fim)
+    # Arredondado para ter empates: o desempate do argmin/argmax também precisa bater
+    niveis = np.round(70 * np.exp(np.cumsum(rng.normal(0, 0.02, size=len(datas)))), 1)
+    return pd.Series(niveis, index=datas)
+
+
+def _incremental(precos, cortes):
+    analytics = EventAnalytics()
+    for fim in cortes:
+        analytics.update(precos.iloc[:fim])
+    return analytics
+
+
+def _assert_igual_do_zero(analytics, precos):
+    do_zero = EventAnalytics(precos)
+    np.testing.assert_array_equal(analytics.datas, do_zero.datas)
+    np.testing.assert_array_equal(analytics.valores, do_zero.valores)
+    np.testing.assert_allclose(analytics._soma, do_zero._soma)
+    for tabela, esperada in ((analytics._argmin, do_zero._argmin), (analytics._argmax, do_zero._argmax)):
+        assert len(tabela) == len(esperada)
+        for nivel, indices in enumerate(esperada):
+            np.testing.assert_array_equal(tabela[nivel], indices, err_msg=f"nível {nivel}")
+    pd.testing.assert_frame_equal(analytics.yearly(), do_zero.yearly())
+    pd.testing.assert_frame_equal(analytics.events(), do_zero.events())
+
+
+# Cortes em torno das potências de dois (onde a tabela esparsa ganha um nível), um pregão por vez
+# e blocos grandes
+@pytest.mark.parametrize("cortes", [
+    [1, 2, 3, 4, 5, 7, 8, 9, 15, 16, 17, 31, 32, 33, None],
+    list(range(1, 70)) + [None],
+    [1000, 1024, 1025, 2047, 2048, 2049, None],
+])
+def test_update_incremental_igual_a_construcao_do_zero(cortes):
+    precos = _precos()
+    analytics = _incremental(precos, cortes)
+    assert len(analytics) == len(precos)
+    _assert_igual_do_zero(analytics, precos)
+
+
+def test_update_com_historico_revisado_recomeca_do_zero():
+    precos = _precos()
+    analytics = EventAnalytics(precos.iloc[:3000])
+
+    corrigidos = precos.copy()
+    corrigidos.iloc[10] = corrigidos.max() + 1  # vira o máximo das janelas que o contêm
+    assert analytics.update(corrigidos) == len(corrigidos)
+    _assert_igual_do_zero(analytics, corrigidos)
+    assert analytics.overall().data_maximo == corrigidos.index[10]
+
+
+def test_update_com_historico_encurtado_recomeca_do_zero():
+    precos = _precos()
+    analytics = EventAnalytics(precos)
+    assert analytics.update(precos.iloc[:2000]) == 2000
+    _assert_igual_do_zero(analytics, precos.iloc[:2000])
+
+
+@pytest.mark.parametrize("evento", EVENTOS, ids=lambda e: e.nome)
+def test_window_incremental_igual_a_construcao_do_zero(evento):
+    precos = _precos()
+    analytics = _incremental(precos, range(250, len(precos) + 250, 250))
+    obtido = analytics.window(evento.inicio, evento.fim)
+    esperado = EventAnalytics(precos).window(evento.inicio, evento.fim)
+    assert (obtido.inicio, obtido.fim, obtido.dias) == (esperado.inicio, esperado.fim, esperado.dias)
+    assert (obtido.data_minimo, obtido.data_maximo) == (esperado.data_minimo, esperado.data_maximo)
+    assert obtido.media == pytest.approx(esperado.media)
+    assert obtido.variacao == pytest.approx(esperado.variacao, abs=1e-9)
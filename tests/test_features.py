@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from petroleo.features import DEFAULT_FEATURES, FeatureStore, compute_features, rolling_mean, rolling_std, volatility
+
+FEATURES = DEFAULT_FEATURES + (rolling_mean(5), rolling_std(5), volatility(5))
+
+
+def _precos(dias=120, seed=0):
+    rng = np.random.default_rng(seed)
+    niveis = 80 * np.exp(np.cumsum(rng.normal(0, 0.02, size=dias)))
+    return pd.Series(niveis, index=pd.bdate_range("2022-01-03", periods=dias, name="Date"))
+
+
+def _store(tmp_path):
+    store = FeatureStore(tmp_path, features=FEATURES)
+    assert store.lookback == 6
+    return store
+
+
+def _assert_igual_do_zero(df, precos):
+    pd.testing.assert_frame_equal(df, compute_features(precos, FEATURES), check_freq=False)
+
+
+# Primeira gravação logo acima do lookback (menor histórico que ainda usa a cauda), blocos de
+# tamanho 1, igual ao lookback e maior que ele
+@pytest.mark.parametrize("inicial", [7, 8, 60])
+@pytest.mark.parametrize("bloco", [1, 6, 25])
+def test_update_incremental_igual_ao_calculo_completo(tmp_path, inicial, bloco):
+    precos = _precos()
+    store = _store(tmp_path)
+    store.update("BZ=F", precos.iloc[:inicial])
+    for fim in range(inicial + bloco, len(precos) + bloco, bloco):
+        df = store.update("BZ=F", precos.iloc[:fim])
+        _assert_igual_do_zero(df, precos.iloc[:fim])
+    _assert_igual_do_zero(pd.read_parquet(store.path("BZ=F")), precos)
+
+
+def test_update_com_historico_no_limite_do_lookback_recalcula_tudo(tmp_path):
+    precos = _precos()
+    store = _store(tmp_path)
+    store.update("BZ=F", precos.iloc[:store.lookback])
+    _assert_igual_do_zero(store.update("BZ=F", precos.iloc[:store.lookback + 3]), precos.iloc[:store.lookback + 3])
+
+
+@pytest.mark.parametrize("revisado", [2, 55, 59])
+def test_update_com_historico_revisado_recalcula_tudo(tmp_path, revisado):
+    precos = _precos()
+    store = _store(tmp_path)
+    store.update("BZ=F", precos.iloc[:60])
+
+    corrigidos = precos.copy()
+    corrigidos.iloc[revisado] *= 1.05
+    _assert_igual_do_zero(store.update("BZ=F", corrigidos), corrigidos)
+
+
+def test_update_sem_pregoes_novos_devolve_o_gravado(tmp_path):
+    precos = _precos()
+    store = _store(tmp_path)
+    store.update("BZ=F", precos)
+    _assert_igual_do_zero(store.update("BZ=F", precos), precos)